@@ -0,0 +1,239 @@
+# connectors/async_connector.py
+import asyncio
+import logging
+import os
+import re
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Dict, List, Tuple
+from uuid import UUID
+
+import asyncpg
+import pandas as pd
+
+from app.connectors.base import DEFAULT_BATCH_SIZE
+from app.connectors.connection_pool import ConnectorPool, connector_pools, params_fingerprint
+from app.connectors.connector_factory import ConnectorFactory
+from app.utils.config import settings
+
+logger = logging.getLogger(__name__)
+
+class AsyncBaseConnector(ABC):
+    """
+    Awaitable query API for a data source, safe to call from the event loop.
+    Exposes the same source_type/database/schema attributes as the blocking
+    connector, which the services use to build source-specific SQL.
+    """
+
+    def __init__(self, connection):
+        self.connection_id = connection.id
+        self.source_type = connection.source_type
+        # Built but not connected: only its attribute defaults are needed
+        template = ConnectorFactory.get_connector(connection.source_type, **connection.connection_params)
+        self.database = getattr(template, 'database', None)
+        self.schema = getattr(template, 'schema', None)
+
+    @abstractmethod
+    async def aquery(self, query_string, params=None) -> List[Dict]:
+        pass
+
+    @abstractmethod
+    def aiter_query(self, query_string, params=None, batch_size=DEFAULT_BATCH_SIZE) -> AsyncIterator[List[Dict]]:
+        pass
+
+    async def aquery_frame(self, query_string, params=None) -> pd.DataFrame:
+        frames = []
+        async for batch in self.aiter_query(query_string, params):
+            frames.append(pd.DataFrame.from_records(batch))
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    async def aclose(self):
+        pass
+
+class ThreadedAsyncConnector(AsyncBaseConnector):
+    """
+    Runs a blocking connector from the shared connector pool on a thread
+    pool of its own. The executor is sized to the connector pool, so one
+    source can tie up at most that many threads and never the event loop.
+    """
+
+    def __init__(self, connection, pool: ConnectorPool, max_workers: int):
+        super().__init__(connection)
+        self.pool = pool
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix=f"connector-{connection.id}"
+        )
+
+    def _call(self, method: str, *args):
+        connector = self.pool.checkout()
+        try:
+            return getattr(connector, method)(*args)
+        finally:
+            self.pool.checkin(connector)
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+
+    async def aquery(self, query_string, params=None):
+        if params is None:
+            return await self._run(self._call, 'query', query_string)
+        return await self._run(self._call, 'query', query_string, params)
+
+    async def aiter_query(self, query_string, params=None, batch_size=DEFAULT_BATCH_SIZE):
+        connector = await self._run(self.pool.checkout)
+        batches = connector.iter_query(query_string, params, batch_size)
+        try:
+            while True:
+                # Each step may hit the network, so it runs on the executor too
+                batch = await self._run(next, batches, None)
+                if batch is None:
+                    break
+                yield batch
+        finally:
+            await self._run(batches.close)
+            await self._run(self.pool.checkin, connector)
+
+    async def aquery_frame(self, query_string, params=None):
+        return await self._run(self._call, 'query_frame', query_string, params)
+
+    async def aclose(self):
+        self.executor.shutdown(wait=False)
+
+class AsyncPostgreSQLConnector(AsyncBaseConnector):
+    """PostgreSQL over an asyncpg pool, created on first use in the running loop."""
+
+    PLACEHOLDER = re.compile(r"%%|%s")
+
+    def __init__(self, connection, max_size: int, idle_seconds: float):
+        super().__init__(connection)
+        params = connection.connection_params
+        self.host = params.get('host')
+        self.username = params.get('username') or params.get('user')
+        self.password = params.get('password')
+        self.port = int(params.get('port') or 5432)
+        self.sslmode = os.getenv('POSTGRES_SSLMODE', 'prefer')
+        self.max_size = max_size
+        self.idle_seconds = idle_seconds
+        self._pool = None
+        self._pool_lock = asyncio.Lock()
+
+    async def _get_pool(self):
+        if self._pool is None:
+            async with self._pool_lock:
+                if self._pool is None:
+                    try:
+                        self._pool = await asyncpg.create_pool(
+                            host=self.host,
+                            user=self.username,
+                            password=self.password,
+                            database=self.database,
+                            port=self.port,
+                            ssl=self.sslmode,
+                            min_size=0,
+                            max_size=self.max_size,
+                            max_inactive_connection_lifetime=self.idle_seconds,
+                            timeout=10
+                        )
+                    except (OSError, asyncpg.PostgresError) as e:
+                        logger.error(f"PostgreSQL connection error: {str(e)}")
+                        raise ValueError(f"Database connection failed: {str(e)}")
+        return self._pool
+
+    def _translate(self, query_string, params) -> Tuple[str, tuple]:
+        """Rewrite the psycopg2-style %s placeholders the services use to $n."""
+        if not params:
+            return query_string, ()
+        position = 0
+
+        def placeholder(match):
+            nonlocal position
+            if match.group() == '%%':
+                return '%'
+            position += 1
+            return f"${position}"
+
+        return self.PLACEHOLDER.sub(placeholder, query_string), tuple(params)
+
+    async def aquery(self, query_string, params=None):
+        pool = await self._get_pool()
+        sql, args = self._translate(query_string, params)
+        try:
+            records = await pool.fetch(sql, *args)
+        except Exception as e:
+            logger.error(f"Query execution failed: {str(e)}")
+            logger.error(f"Query: {query_string}")
+            logger.error(f"Params: {params}")
+            raise ValueError(f"Query execution failed: {str(e)}")
+        return [dict(record) for record in records]
+
+    async def aiter_query(self, query_string, params=None, batch_size=DEFAULT_BATCH_SIZE):
+        pool = await self._get_pool()
+        sql, args = self._translate(query_string, params)
+        async with pool.acquire() as conn:
+            # asyncpg cursors are server-side and need a transaction
+            async with conn.transaction():
+                cursor = await conn.cursor(sql, *args)
+                while True:
+                    records = await cursor.fetch(batch_size)
+                    if not records:
+                        break
+                    yield [dict(record) for record in records]
+
+    async def aquery_frame(self, query_string, params=None):
+        pool = await self._get_pool()
+        sql, args = self._translate(query_string, params)
+        async with pool.acquire() as conn:
+            statement = await conn.prepare(sql)
+            records = await statement.fetch(*args)
+            columns = [attribute.name for attribute in statement.get_attributes()]
+        # Records are tuples; skip the per-row dict the generic path builds
+        return pd.DataFrame.from_records(records, columns=columns)
+
+    async def aclose(self):
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+class AsyncConnectorRegistry:
+    """
+    Async connectors per DataSourceConnection, keyed like connector_pools so
+    a params change retires the old connector. PostgreSQL gets asyncpg; every
+    other source runs its blocking driver on a bounded per-source executor.
+    """
+
+    def __init__(self, max_size: int = 4, idle_seconds: float = 300.0):
+        self.max_size = max_size
+        self.idle_seconds = idle_seconds
+        self._connectors: Dict[Tuple[UUID, str], AsyncBaseConnector] = {}
+        self._lock = threading.Lock()
+
+    def _create(self, connection) -> AsyncBaseConnector:
+        if connection.source_type == 'postgresql':
+            return AsyncPostgreSQLConnector(connection, self.max_size, self.idle_seconds)
+        return ThreadedAsyncConnector(connection, connector_pools.pool(connection), self.max_size)
+
+    def get(self, connection) -> AsyncBaseConnector:
+        key = (connection.id, params_fingerprint(connection.connection_params))
+        stale = []
+        with self._lock:
+            connector = self._connectors.get(key)
+            if connector is None:
+                stale = [self._connectors.pop(k) for k in list(self._connectors) if k[0] == connection.id]
+                connector = self._create(connection)
+                self._connectors[key] = connector
+        for old in stale:
+            asyncio.get_running_loop().create_task(old.aclose())
+        return connector
+
+    async def close_all(self):
+        with self._lock:
+            connectors, self._connectors = list(self._connectors.values()), {}
+        for connector in connectors:
+            await connector.aclose()
+
+async_connectors = AsyncConnectorRegistry(
+    max_size=settings.CONNECTOR_POOL_MAX_SIZE,
+    idle_seconds=settings.CONNECTOR_POOL_IDLE_SECONDS
+)
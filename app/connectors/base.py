@@ -1,6 +1,25 @@
 # connectors/base.py
 from abc import ABC, abstractmethod
 
+import pandas as pd
+import pyarrow as pa
+
+# Rows per batch yielded by iter_query
+DEFAULT_BATCH_SIZE = 5000
+# Rows per statement / API call in bulk_insert and upsert
+DEFAULT_WRITE_BATCH_SIZE = 1000
+
+def row_columns(rows):
+    """Every column named by any row, in first-seen order."""
+    columns = {}
+    for row in rows:
+        columns.update(dict.fromkeys(row))
+    return list(columns)
+
+def dedupe_by_key(rows, key_columns):
+    """Keep the last row per key; one statement may not touch a target row twice."""
+    return list({tuple(row.get(column) for column in key_columns): row for row in rows}.values())
+
 class BaseConnector(ABC):
     @abstractmethod
     def connect(self):
@@ -11,14 +30,53 @@ class BaseConnector(ABC):
     def disconnect(self):
         pass
 
+    def ping(self) -> bool:
+        """Whether the connection is still usable; checked before pooled reuse."""
+        return getattr(self, 'connection', None) is not None
+
+    def reset(self):
+        """Clear per-use state before the connector goes back to its pool."""
+        pass
+
     @abstractmethod
     def query(self, query_string):
         pass
 
+    def iter_query(self, query_string, params=None, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Yield the result of a query as lists of at most `batch_size` row dicts.
+        Drivers that can stream override this; the fallback fetches everything.
+        """
+        rows = self.query(query_string) if params is None else self.query(query_string, params)
+        for start in range(0, len(rows), batch_size):
+            yield rows[start:start + batch_size]
+
+    def query_frame(self, query_string, params=None) -> pd.DataFrame:
+        """
+        Run a query into a DataFrame. Drivers with a columnar path override
+        this; the fallback builds one frame per iter_query batch.
+        """
+        frames = [pd.DataFrame.from_records(batch) for batch in self.iter_query(query_string, params)]
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    def query_arrow(self, query_string, params=None) -> pa.Table:
+        """Run a query into an Arrow table."""
+        return pa.Table.from_pandas(self.query_frame(query_string, params), preserve_index=False)
+
     @abstractmethod
     def insert(self, table, data):
         pass
 
+    @abstractmethod
+    def bulk_insert(self, table, rows, batch_size=DEFAULT_WRITE_BATCH_SIZE):
+        """Insert a list of row dicts in chunks, all in one transaction."""
+        pass
+
+    @abstractmethod
+    def upsert(self, table, rows, key_columns, batch_size=DEFAULT_WRITE_BATCH_SIZE):
+        """Insert rows, updating those whose `key_columns` already exist."""
+        pass
+
     @abstractmethod
     def update(self, table, data, condition):
         pass
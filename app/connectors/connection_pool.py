@@ -0,0 +1,203 @@
+# connectors/connection_pool.py
+import atexit
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Iterator, Tuple
+from uuid import UUID
+
+from app.connectors.base import BaseConnector
+from app.connectors.connector_factory import ConnectorFactory
+from app.utils.config import settings
+
+logger = logging.getLogger(__name__)
+
+def params_fingerprint(connection_params: dict) -> str:
+    """Stable hash of a connection's params; changes whenever credentials do."""
+    encoded = json.dumps(connection_params or {}, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()[:16]
+
+class ConnectorPool:
+    """
+    Connected connectors for one data source, reused across operations.
+
+    At most `max_size` idle connectors are kept. Checkouts beyond that open an
+    overflow connector that is disconnected on return instead of blocking,
+    since callers run on the event loop. Idle connectors are health checked on
+    checkout and evicted after `idle_seconds`.
+    """
+
+    def __init__(self, source_type: str, connection_params: dict, max_size: int = 4, idle_seconds: float = 300.0):
+        self.source_type = source_type
+        self.connection_params = dict(connection_params or {})
+        self.max_size = max_size
+        self.idle_seconds = idle_seconds
+        self._idle: Deque[Tuple[BaseConnector, float]] = deque()
+        self._checked_out = 0
+        self._lock = threading.Lock()
+        self.closed = False
+
+    def _create(self) -> BaseConnector:
+        connector = ConnectorFactory.get_connector(self.source_type, **self.connection_params)
+        connector.connect()
+        return connector
+
+    def _close(self, connector: BaseConnector):
+        try:
+            connector.disconnect()
+        except Exception as e:
+            logger.error(f"Error disconnecting pooled {self.source_type} connector: {str(e)}")
+
+    def checkout(self) -> BaseConnector:
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                # Most recently returned first: the likeliest to still be alive
+                connector, returned_at = self._idle.pop()
+            if time.monotonic() - returned_at > self.idle_seconds or not connector.ping():
+                self._close(connector)
+                continue
+            with self._lock:
+                self._checked_out += 1
+            return connector
+
+        connector = self._create()
+        with self._lock:
+            self._checked_out += 1
+            if self._checked_out > self.max_size:
+                logger.info(f"{self.source_type} pool exhausted ({self.max_size}); opened an overflow connector")
+        return connector
+
+    def checkin(self, connector: BaseConnector):
+        with self._lock:
+            self._checked_out -= 1
+            keep = not self.closed and len(self._idle) + self._checked_out < self.max_size
+        if keep:
+            try:
+                connector.reset()
+            except Exception as e:
+                logger.warning(f"Discarding {self.source_type} connector that failed to reset: {str(e)}")
+                keep = False
+        if not keep:
+            self._close(connector)
+            return
+        with self._lock:
+            self._idle.append((connector, time.monotonic()))
+
+    def prune(self):
+        """Disconnect connectors idle for longer than `idle_seconds`."""
+        cutoff = time.monotonic() - self.idle_seconds
+        with self._lock:
+            expired = [connector for connector, returned_at in self._idle if returned_at <= cutoff]
+            self._idle = deque((connector, returned_at) for connector, returned_at in self._idle if returned_at > cutoff)
+        for connector in expired:
+            self._close(connector)
+
+    def close(self):
+        """Disconnect idle connectors; checked-out ones are closed on return."""
+        with self._lock:
+            self.closed = True
+            idle, self._idle = list(self._idle), deque()
+        for connector, _ in idle:
+            self._close(connector)
+
+    @property
+    def idle(self) -> int:
+        return len(self._idle)
+
+    @property
+    def checked_out(self) -> int:
+        return self._checked_out
+
+class ConnectorPoolRegistry:
+    """
+    Process-wide connector pools keyed by DataSourceConnection id and a
+    fingerprint of its params, so edited credentials get a fresh pool and the
+    old one is closed.
+    """
+
+    def __init__(self, max_size: int = 4, idle_seconds: float = 300.0):
+        self.max_size = max_size
+        self.idle_seconds = idle_seconds
+        self._pools: Dict[Tuple[UUID, str], ConnectorPool] = {}
+        self._lock = threading.Lock()
+        self._last_prune = time.monotonic()
+
+    def pool(self, connection) -> ConnectorPool:
+        fingerprint = params_fingerprint(connection.connection_params)
+        key = (connection.id, fingerprint)
+        stale = []
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                stale = [k for k in self._pools if k[0] == connection.id]
+                stale = [self._pools.pop(k) for k in stale]
+                pool = ConnectorPool(
+                    connection.source_type,
+                    connection.connection_params,
+                    max_size=self.max_size,
+                    idle_seconds=self.idle_seconds
+                )
+                self._pools[key] = pool
+        for old in stale:
+            logger.info(f"Connection {connection.id} params changed; closing its previous pool")
+            old.close()
+        self._maybe_prune()
+        return pool
+
+    @contextmanager
+    def connection(self, connection) -> Iterator[BaseConnector]:
+        """
+        Borrow a connected connector for `connection`:
+
+            with connector_pools.connection(connection) as connector:
+                rows = connector.query(sql)
+        """
+        pool = self.pool(connection)
+        connector = pool.checkout()
+        try:
+            yield connector
+        finally:
+            pool.checkin(connector)
+
+    def _maybe_prune(self):
+        # Evict lazily from whichever request comes by; no reaper thread needed
+        now = time.monotonic()
+        if now - self._last_prune < self.idle_seconds / 2:
+            return
+        self._last_prune = now
+        self.prune()
+
+    def prune(self):
+        with self._lock:
+            pools = list(self._pools.values())
+        for pool in pools:
+            pool.prune()
+
+    def close_all(self):
+        with self._lock:
+            pools, self._pools = list(self._pools.values()), {}
+        for pool in pools:
+            pool.close()
+
+    def stats(self) -> Dict[str, dict]:
+        with self._lock:
+            return {
+                f"{connection_id}:{fingerprint}": {
+                    "source_type": pool.source_type,
+                    "idle": pool.idle,
+                    "checked_out": pool.checked_out
+                }
+                for (connection_id, fingerprint), pool in self._pools.items()
+            }
+
+connector_pools = ConnectorPoolRegistry(
+    max_size=settings.CONNECTOR_POOL_MAX_SIZE,
+    idle_seconds=settings.CONNECTOR_POOL_IDLE_SECONDS
+)
+atexit.register(connector_pools.close_all)
@@ -1,6 +1,6 @@
 from google.oauth2.credentials import Credentials
 from googleapiclient.discovery import build
-from app.connectors.base import BaseConnector
+from app.connectors.base import DEFAULT_WRITE_BATCH_SIZE, BaseConnector, dedupe_by_key, row_columns
 
 class GoogleSheetsConnector(BaseConnector):
     def __init__(self, credentials_file, spreadsheet_id):
@@ -16,6 +16,9 @@ class GoogleSheetsConnector(BaseConnector):
         if self.service:
             self.service.close()
 
+    def ping(self):
+        return self.service is not None
+
     def query(self, range_name):
         sheet = self.service.spreadsheets()
         result = sheet.values().get(spreadsheetId=self.spreadsheet_id, range=range_name).execute()
@@ -33,6 +36,66 @@ class GoogleSheetsConnector(BaseConnector):
             spreadsheetId=self.spreadsheet_id, range=range_name,
             valueInputOption='USER_ENTERED', body=body).execute()
 
+    def bulk_insert(self, range_name, rows, batch_size=DEFAULT_WRITE_BATCH_SIZE):
+        """Append rows with one values().append call per `batch_size` rows."""
+        if not rows:
+            return 0
+        columns = row_columns(rows)
+        values = [[row.get(column, '') for column in columns] for row in rows]
+        sheet = self.service.spreadsheets()
+        for start in range(0, len(values), batch_size):
+            sheet.values().append(
+                spreadsheetId=self.spreadsheet_id, range=range_name,
+                valueInputOption='USER_ENTERED', insertDataOption='INSERT_ROWS',
+                body={'values': values[start:start + batch_size]}).execute()
+        return len(values)
+
+    def upsert(self, range_name, rows, key_columns, batch_size=DEFAULT_WRITE_BATCH_SIZE):
+        """
+        Match rows on `key_columns` against the sheet (header row first, data
+        starting at column A), rewrite matches with one batchUpdate and append
+        the rest.
+        """
+        if not rows:
+            return 0
+        rows = dedupe_by_key(rows, key_columns)
+        sheet = self.service.spreadsheets()
+        existing = sheet.values().get(spreadsheetId=self.spreadsheet_id, range=range_name).execute().get('values', [])
+        if not existing:
+            return self.bulk_insert(range_name, rows, batch_size)
+
+        headers = existing[0]
+        key_positions = [headers.index(column) for column in key_columns]
+        # Sheets returns cells as strings, so keys are compared as strings
+        row_numbers = {
+            tuple(str(values[i]) if i < len(values) else '' for i in key_positions): number
+            for number, values in enumerate(existing[1:], start=2)
+        }
+        sheet_name = range_name.split('!')[0]
+        updates, inserts = [], []
+        for row in rows:
+            number = row_numbers.get(tuple(str(row.get(column, '')) for column in key_columns))
+            if number is None:
+                inserts.append(row)
+            else:
+                updates.append({
+                    'range': f"{sheet_name}!A{number}",
+                    'values': [[row.get(header, '') for header in headers]]
+                })
+
+        for start in range(0, len(updates), batch_size):
+            sheet.values().batchUpdate(
+                spreadsheetId=self.spreadsheet_id,
+                body={'valueInputOption': 'USER_ENTERED', 'data': updates[start:start + batch_size]}).execute()
+        if inserts:
+            values = [[row.get(header, '') for header in headers] for row in inserts]
+            for start in range(0, len(values), batch_size):
+                sheet.values().append(
+                    spreadsheetId=self.spreadsheet_id, range=range_name,
+                    valueInputOption='USER_ENTERED', insertDataOption='INSERT_ROWS',
+                    body={'values': values[start:start + batch_size]}).execute()
+        return len(rows)
+
     def update(self, range_name, data):
         sheet = self.service.spreadsheets()
         values = [[data[header] for header in data.keys()]]
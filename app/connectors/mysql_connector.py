@@ -1,5 +1,7 @@
 import mysql.connector
-from app.connectors.base import BaseConnector
+import pandas as pd
+from mysql.connector import FieldType
+from app.connectors.base import DEFAULT_BATCH_SIZE, DEFAULT_WRITE_BATCH_SIZE, BaseConnector, dedupe_by_key, row_columns
 import logging
 
 logger = logging.getLogger(__name__)
@@ -33,6 +35,13 @@ class MySQLConnector(BaseConnector):
         if self.connection:
             self.connection.close()
 
+    def ping(self):
+        return bool(self.connection) and self.connection.is_connected()
+
+    def reset(self):
+        if self.connection:
+            self.connection.rollback()
+
     def query(self, query_string, params=None):
         cursor = None
         try:
@@ -52,6 +61,74 @@ class MySQLConnector(BaseConnector):
             if cursor:
                 cursor.close()
 
+    def iter_query(self, query_string, params=None, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Stream a query through an unbuffered cursor, yielding lists of at most
+        `batch_size` rows instead of buffering the whole result client-side.
+        """
+        cursor = None
+        try:
+            cursor = self.connection.cursor(dictionary=True, buffered=False)
+            if params:
+                cursor.execute(query_string, params)
+            else:
+                cursor.execute(query_string)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield rows
+        except mysql.connector.Error as e:
+            logger.error(f"MySQL streaming query error: {str(e)}")
+            logger.error(f"Query: {query_string}")
+            logger.error(f"Params: {params}")
+            raise
+        finally:
+            if cursor:
+                # A consumer that stops early leaves rows on the wire; drain
+                # them or the connection refuses the next statement
+                if self.connection.unread_result:
+                    self.connection.consume_results()
+                cursor.close()
+
+    def query_frame(self, query_string, params=None):
+        """
+        Run a query into a DataFrame, streaming tuples from an unbuffered
+        cursor into one buffer per column instead of a dict per row.
+        """
+        cursor = None
+        try:
+            cursor = self.connection.cursor(buffered=False)
+            if params:
+                cursor.execute(query_string, params)
+            else:
+                cursor.execute(query_string)
+            names = [column[0] for column in cursor.description]
+            decimals = [column[0] for column in cursor.description if column[1] == FieldType.NEWDECIMAL]
+            buffers = [[] for _ in names]
+            while True:
+                rows = cursor.fetchmany(DEFAULT_BATCH_SIZE)
+                if not rows:
+                    break
+                for buffer, values in zip(buffers, zip(*rows)):
+                    buffer.extend(values)
+        except mysql.connector.Error as e:
+            logger.error(f"MySQL columnar query error: {str(e)}")
+            logger.error(f"Query: {query_string}")
+            logger.error(f"Params: {params}")
+            raise
+        finally:
+            if cursor:
+                if self.connection.unread_result:
+                    self.connection.consume_results()
+                cursor.close()
+
+        frame = pd.DataFrame(dict(zip(names, buffers)), columns=names)
+        for name in decimals:
+            # DECIMAL arrives as Decimal objects; analysis wants float columns
+            frame[name] = pd.to_numeric(frame[name], errors='coerce')
+        return frame
+
     def verify_table_exists(self, table_name: str) -> bool:
         """Verify that a table exists in the current database."""
         try:
@@ -99,6 +176,49 @@ class MySQLConnector(BaseConnector):
             if cursor:
                 cursor.close()
 
+    def _write_many(self, statement, columns, rows, batch_size):
+        values = [tuple(row.get(column) for column in columns) for row in rows]
+        cursor = None
+        try:
+            cursor = self.connection.cursor()
+            # executemany rewrites an INSERT into one multi-row statement per chunk
+            for start in range(0, len(values), batch_size):
+                cursor.executemany(statement, values[start:start + batch_size])
+            self.connection.commit()
+        except mysql.connector.Error as e:
+            self.connection.rollback()
+            logger.error(f"MySQL bulk write error: {str(e)}")
+            raise
+        finally:
+            if cursor:
+                cursor.close()
+        return len(values)
+
+    def bulk_insert(self, table, rows, batch_size=DEFAULT_WRITE_BATCH_SIZE):
+        if not rows:
+            return 0
+        columns = row_columns(rows)
+        placeholders = ', '.join(['%s'] * len(columns))
+        statement = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+        return self._write_many(statement, columns, rows, batch_size)
+
+    def upsert(self, table, rows, key_columns, batch_size=DEFAULT_WRITE_BATCH_SIZE):
+        """
+        INSERT ... ON DUPLICATE KEY UPDATE. MySQL matches on the table's own
+        primary/unique keys, which must cover `key_columns`.
+        """
+        if not rows:
+            return 0
+        rows = dedupe_by_key(rows, key_columns)
+        columns = row_columns(rows)
+        updates = [column for column in columns if column not in key_columns] or list(key_columns)
+        placeholders = ', '.join(['%s'] * len(columns))
+        statement = (
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders}) "
+            f"ON DUPLICATE KEY UPDATE {', '.join(f'{column} = VALUES({column})' for column in updates)}"
+        )
+        return self._write_many(statement, columns, rows, batch_size)
+
     def update(self, table, data, condition):
         cursor = None
         try:
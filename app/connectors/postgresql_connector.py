@@ -1,12 +1,19 @@
 import psycopg2
 import psycopg2.extras
-from app.connectors.base import BaseConnector
+import pandas as pd
+from app.connectors.base import DEFAULT_BATCH_SIZE, DEFAULT_WRITE_BATCH_SIZE, BaseConnector, dedupe_by_key, row_columns
+import io
 import logging
 import os
+import uuid
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Type OIDs that need help when read back from COPY's CSV output
+DATE_TYPE_OIDS = {1082, 1114, 1184}  # date, timestamp, timestamptz
+TEXT_TYPE_OIDS = {18, 19, 25, 1042, 1043, 2950}  # char, name, text, bpchar, varchar, uuid
+
 class PostgreSQLConnector(BaseConnector):
     def __init__(self, host, username, password, database, port=5432):
         super().__init__()  # Call parent constructor
@@ -68,6 +75,23 @@ class PostgreSQLConnector(BaseConnector):
         except Exception as e:
             logger.error(f"Error closing PostgreSQL connection: {str(e)}")
 
+    def ping(self):
+        if not self.connection or self.connection.closed:
+            return False
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+                cursor.fetchone()
+            self.connection.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def reset(self):
+        # End the implicit transaction so pooled connections never sit idle in one
+        if self.connection and not self.connection.closed:
+            self.connection.rollback()
+
     def query(self, query_string, params=None):
         """Execute query with error handling and automatic reconnection."""
         if not self.connection:
@@ -92,6 +116,74 @@ class PostgreSQLConnector(BaseConnector):
             logger.error(f"Params: {params}")
             raise ValueError(f"Query execution failed: {str(e)}")
 
+    def iter_query(self, query_string, params=None, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Stream a query through a named (server-side) cursor, yielding lists of
+        at most `batch_size` rows, so only one batch is held in memory.
+        """
+        if not self.connection or self.connection.closed:
+            self.connect()
+
+        cursor = self.connection.cursor(
+            name=f"iter_{uuid.uuid4().hex}",
+            cursor_factory=psycopg2.extras.RealDictCursor
+        )
+        try:
+            cursor.execute(query_string, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield rows
+        except psycopg2.Error as e:
+            logger.error(f"Streaming query failed: {str(e)}")
+            logger.error(f"Query: {query_string}")
+            logger.error(f"Params: {params}")
+            raise ValueError(f"Query execution failed: {str(e)}")
+        finally:
+            try:
+                cursor.close()
+            except psycopg2.Error:
+                pass
+            # The named cursor lives in a transaction; end it either way
+            if not self.connection.closed:
+                self.connection.rollback()
+
+    def query_frame(self, query_string, params=None):
+        """
+        Run a query into a DataFrame through COPY ... TO STDOUT, so rows are
+        parsed column-wise by pandas rather than built as dicts. Column types
+        come from a LIMIT 0 probe of the same query.
+        """
+        if not self.connection or self.connection.closed:
+            self.connect()
+
+        sql = query_string.strip().rstrip(';')
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute(f"SELECT * FROM ({sql}) AS frame_probe LIMIT 0", params)
+                columns = [(column.name, column.type_code) for column in cursor.description]
+                # COPY takes no bind parameters; inline them with the driver's quoting
+                statement = cursor.mogrify(sql, params).decode() if params else sql
+                buffer = io.BytesIO()
+                cursor.copy_expert(f"COPY ({statement}) TO STDOUT WITH (FORMAT csv, HEADER true)", buffer)
+            self.connection.rollback()
+        except psycopg2.Error as e:
+            self.connection.rollback()
+            logger.error(f"Columnar query failed: {str(e)}")
+            logger.error(f"Query: {query_string}")
+            logger.error(f"Params: {params}")
+            raise ValueError(f"Query execution failed: {str(e)}")
+
+        buffer.seek(0)
+        return pd.read_csv(
+            buffer,
+            dtype={name: str for name, type_code in columns if type_code in TEXT_TYPE_OIDS},
+            parse_dates=[name for name, type_code in columns if type_code in DATE_TYPE_OIDS],
+            true_values=['t'],
+            false_values=['f']
+        )
+
     def insert(self, table, data):
         """Insert data with error handling."""
         try:
@@ -106,6 +198,49 @@ class PostgreSQLConnector(BaseConnector):
             logger.error(f"Insert operation failed: {str(e)}")
             raise ValueError(f"Failed to insert data: {str(e)}")
 
+    def _write_values(self, statement, columns, rows, batch_size):
+        if not self.connection or self.connection.closed:
+            self.connect()
+        values = [tuple(row.get(column) for column in columns) for row in rows]
+        try:
+            with self.connection.cursor() as cursor:
+                # One multi-row INSERT per page of batch_size rows
+                psycopg2.extras.execute_values(cursor, statement, values, page_size=batch_size)
+            self.connection.commit()
+        except Exception as e:
+            self.connection.rollback()
+            logger.error(f"Bulk write failed: {str(e)}")
+            raise ValueError(f"Failed to write data: {str(e)}")
+        return len(values)
+
+    def bulk_insert(self, table, rows, batch_size=DEFAULT_WRITE_BATCH_SIZE):
+        """Insert rows with multi-row INSERTs in one transaction."""
+        if not rows:
+            return 0
+        columns = row_columns(rows)
+        statement = f"INSERT INTO {table} ({', '.join(columns)}) VALUES %s"
+        return self._write_values(statement, columns, rows, batch_size)
+
+    def upsert(self, table, rows, key_columns, batch_size=DEFAULT_WRITE_BATCH_SIZE):
+        """
+        INSERT ... ON CONFLICT (key_columns) DO UPDATE in one transaction.
+        key_columns must match a unique index or constraint on the table.
+        """
+        if not rows:
+            return 0
+        rows = dedupe_by_key(rows, key_columns)
+        columns = row_columns(rows)
+        updates = [column for column in columns if column not in key_columns]
+        conflict_action = (
+            "DO UPDATE SET " + ', '.join(f"{column} = EXCLUDED.{column}" for column in updates)
+            if updates else "DO NOTHING"
+        )
+        statement = (
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES %s "
+            f"ON CONFLICT ({', '.join(key_columns)}) {conflict_action}"
+        )
+        return self._write_values(statement, columns, rows, batch_size)
+
     def update(self, table, data, condition):
         """Update data with error handling."""
         try:
@@ -1,5 +1,8 @@
 from simple_salesforce import Salesforce
-from app.connectors.base import BaseConnector
+from app.connectors.base import DEFAULT_BATCH_SIZE, DEFAULT_WRITE_BATCH_SIZE, BaseConnector
+import logging
+
+logger = logging.getLogger(__name__)
 
 class SalesforceConnector(BaseConnector):
     def __init__(self, username, password, security_token, domain='login'):
@@ -21,12 +24,56 @@ class SalesforceConnector(BaseConnector):
         # Salesforce doesn't require explicit disconnection
         pass
 
+    def ping(self):
+        return self.sf is not None
+
     def query(self, query_string):
         return self.sf.query_all(query_string)['records']
 
+    def iter_query(self, query_string, params=None, batch_size=DEFAULT_BATCH_SIZE):
+        # query_all_iter follows nextRecordsUrl lazily instead of collecting every page
+        batch = []
+        for record in self.sf.query_all_iter(query_string):
+            batch.append(record)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
     def insert(self, object_name, data):
         return self.sf.__getattr__(object_name).create(data)
 
+    def _bulk_count(self, object_name, action, results):
+        """
+        Rows the Bulk API accepted. Jobs are not transactional, so accepted rows
+        stay written; rejected ones are logged and reported in a ValueError.
+        """
+        failures = [(index, result.get('errors')) for index, result in enumerate(results) if not result.get('success')]
+        for index, errors in failures:
+            logger.error(f"Salesforce bulk {action} into {object_name} rejected row {index}: {errors}")
+        if failures:
+            raise ValueError(
+                f"Salesforce bulk {action} into {object_name}: {len(failures)} of {len(results)} rows failed, "
+                f"first error on row {failures[0][0]}: {failures[0][1]}"
+            )
+        return len(results)
+
+    def bulk_insert(self, object_name, rows, batch_size=DEFAULT_WRITE_BATCH_SIZE):
+        if not rows:
+            return 0
+        # Bulk API jobs instead of one REST create per record
+        results = getattr(self.sf.bulk, object_name).insert(rows, batch_size=batch_size)
+        return self._bulk_count(object_name, 'insert', results)
+
+    def upsert(self, object_name, rows, key_columns, batch_size=DEFAULT_WRITE_BATCH_SIZE):
+        if len(key_columns) != 1:
+            raise ValueError("Salesforce upserts match on exactly one external id field")
+        if not rows:
+            return 0
+        results = getattr(self.sf.bulk, object_name).upsert(rows, key_columns[0], batch_size=batch_size)
+        return self._bulk_count(object_name, 'upsert', results)
+
     def update(self, object_name, record_id, data):
         return self.sf.__getattr__(object_name).update(record_id, data)
 
@@ -1,6 +1,10 @@
 import snowflake.connector
-from app.connectors.base import BaseConnector
+import pandas as pd
+from snowflake.connector.pandas_tools import write_pandas
+from app.connectors.base import DEFAULT_BATCH_SIZE, DEFAULT_WRITE_BATCH_SIZE, BaseConnector, dedupe_by_key, row_columns
 import logging
+import re
+import uuid
 
 logger = logging.getLogger(__name__)
 
@@ -90,6 +94,9 @@ class SnowflakeConnector(BaseConnector):
         if self.connection:
             self.connection.close()
 
+    def ping(self):
+        return bool(self.connection) and not self.connection.is_closed()
+
     def query(self, query_string, params=None):
         if not self.connection or self.connection.is_closed():
             logger.info("Reconnecting to Snowflake as connection was closed")
@@ -116,6 +123,73 @@ class SnowflakeConnector(BaseConnector):
         finally:
             cursor.close()
 
+    def iter_query(self, query_string, params=None, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Yield a query's rows in lists of at most `batch_size`. Snowflake
+        downloads result chunks as the cursor advances, so only the current
+        chunk and batch are held in memory.
+        """
+        if not self.connection or self.connection.is_closed():
+            logger.info("Reconnecting to Snowflake as connection was closed")
+            self.connect()
+
+        cursor = self.connection.cursor(snowflake.connector.DictCursor)
+        try:
+            logger.info(f"Streaming Snowflake query: {query_string}")
+            if params:
+                cursor.execute(query_string, params)
+            else:
+                cursor.execute(query_string)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield rows
+        except Exception as e:
+            logger.error(f"Error executing query: {str(e)}")
+            logger.error(f"Query string: {query_string}")
+            logger.error(f"Parameters: {params}")
+            raise
+        finally:
+            cursor.close()
+
+    def _execute_plain(self, query_string, params=None):
+        if not self.connection or self.connection.is_closed():
+            logger.info("Reconnecting to Snowflake as connection was closed")
+            self.connect()
+
+        cursor = self.connection.cursor()
+        try:
+            logger.info(f"Executing Snowflake query: {query_string}")
+            if params:
+                cursor.execute(query_string, params)
+            else:
+                cursor.execute(query_string)
+            return cursor
+        except Exception as e:
+            cursor.close()
+            logger.error(f"Error executing query: {str(e)}")
+            logger.error(f"Query string: {query_string}")
+            logger.error(f"Parameters: {params}")
+            raise
+
+    def query_frame(self, query_string, params=None):
+        """Run a query into a DataFrame straight from Snowflake's Arrow result chunks."""
+        cursor = self._execute_plain(query_string, params)
+        try:
+            return cursor.fetch_pandas_all()
+        finally:
+            cursor.close()
+
+    def query_arrow(self, query_string, params=None):
+        """Run a query into an Arrow table without a pandas round trip."""
+        cursor = self._execute_plain(query_string, params)
+        try:
+            # force_return_table: an empty result is an empty table, not None
+            return cursor.fetch_arrow_all(force_return_table=True)
+        finally:
+            cursor.close()
+
     def execute_with_result(self, query_string, params=None):
         """Execute a query and ensure we get a result."""
         result = self.query(query_string, params)
@@ -166,6 +240,65 @@ class SnowflakeConnector(BaseConnector):
         finally:
             cursor.close()
 
+    def _stage_rows(self, table, rows, batch_size, **kwargs):
+        """Load rows with write_pandas: Parquet chunks PUT to a stage, then one COPY INTO."""
+        if not self.connection or self.connection.is_closed():
+            self.connect()
+        frame = pd.DataFrame.from_records(rows, columns=row_columns(rows))
+        success, _, row_count, _ = write_pandas(
+            self.connection,
+            frame,
+            table,
+            database=self.database,
+            schema=self.schema,
+            chunk_size=batch_size,
+            quote_identifiers=False,
+            **kwargs
+        )
+        if not success:
+            raise ValueError(f"Failed to load data into {table}")
+        return row_count
+
+    def bulk_insert(self, table, rows, batch_size=DEFAULT_WRITE_BATCH_SIZE):
+        if not rows:
+            return 0
+        return self._stage_rows(table, rows, batch_size)
+
+    def upsert(self, table, rows, key_columns, batch_size=DEFAULT_WRITE_BATCH_SIZE):
+        """Stage rows into a temporary table and MERGE it into `table` in one statement."""
+        if not rows:
+            return 0
+        rows = dedupe_by_key(rows, key_columns)
+        columns = row_columns(rows)
+        # The temporary table lives in the connector's schema: name it after the
+        # unqualified table and quote it, whatever `table` itself looks like
+        base_name = re.sub(r'\W', '_', table.split('.')[-1].strip('"'))
+        staging = f'"{base_name}_UPSERT_{uuid.uuid4().hex[:8]}"'.upper()
+        self._stage_rows(staging, rows, batch_size, auto_create_table=True, table_type='temporary')
+
+        on_clause = ' AND '.join(f"target.{column} = source.{column}" for column in key_columns)
+        updates = [column for column in columns if column not in key_columns]
+        update_clause = (
+            "WHEN MATCHED THEN UPDATE SET " + ', '.join(f"target.{column} = source.{column}" for column in updates)
+            if updates else ""
+        )
+        query = f"""
+            MERGE INTO {table} AS target
+            USING {staging} AS source
+            ON {on_clause}
+            {update_clause}
+            WHEN NOT MATCHED THEN INSERT ({', '.join(columns)})
+                VALUES ({', '.join(f'source.{column}' for column in columns)})
+        """
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(query)
+            self.connection.commit()
+            return len(rows)
+        finally:
+            cursor.execute(f"DROP TABLE IF EXISTS {staging}")
+            cursor.close()
+
     def update(self, table, data, condition):
         set_clause = ', '.join([f"{k} = :{i+1}" for i, k in enumerate(data.keys())])
         query = f"UPDATE {table} SET {set_clause} WHERE {condition}"
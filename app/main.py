@@ -1,31 +1,59 @@
 #services/backend_auth/main.py
-from fastapi import FastAPI, HTTPException, Depends, Request, status, Response
+from fastapi import FastAPI, HTTPException, Depends, Query, Request, status, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.security import OAuth2PasswordRequestForm
 import logging
 from fastapi.openapi.utils import get_openapi
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from fastapi.openapi.models import OAuthFlows, OAuthFlowPassword
 import httpx
-from app.utils.auth import get_current_user, create_access_token, verify_password, get_password_hash
-from app.utils.database import get_db
-from sqlalchemy.orm import Session
-from urllib.parse import unquote
+from app.utils.auth import (
+    get_current_user, get_current_principal, create_access_token, create_refresh_token, averify_password,
+    aget_password_hash, decode_refresh_token, password_hasher, revoke_token, revoke_tokens, FULL_DATA_ACCESS
+)
+from app.utils.revocation import revocation_store
+from app.utils.database import get_db, get_async_db, AsyncSessionLocal
+from app.utils.token_cache import token_cache
+from app.utils.http_client import service_clients
+from app.connectors.async_connector import async_connectors
+from app.utils.routing import RouteTable
+from app.utils.health import create_health_monitor
+from app.utils.circuit_breaker import circuit_breakers
+from app.utils.response_cache import create_response_cache, request_context_key
+from app.utils.single_flight import request_coalescer
+from app.utils.pagination import decode_cursor, encode_cursor, keyset_after, keyset_order, stream_json_array, stream_ndjson
+from app.utils.config import settings
+from prometheus_client import CONTENT_TYPE_LATEST
+from app.utils.metrics import (
+    MetricsMiddleware, UPSTREAM_ERRORS, UPSTREAM_IN_FLIGHT, UPSTREAM_LATENCY,
+    UPSTREAM_REQUEST_BYTES, UPSTREAM_RESPONSE_BYTES, RESPONSE_CACHE_REQUESTS, COALESCED_REQUESTS,
+    count_upstream_bytes, render_metrics, status_class
+)
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.models import User, Organization, InteractionHistory, LikedPost, Article, user_organizations
 from app.schemas.schemas import (
     UserCreate, User as UserSchema, Token, ChatHistoryResponse,
     Organization as OrganizationSchema, EmailRequest, UserResponse, LikedPostResponse
 )
 from datetime import datetime, timedelta
-from sqlalchemy import insert
-from app.services.email_service import generate_verification_token, send_verification_email, send_welcome_email
+from sqlalchemy import func, insert, select
+from app.services.email_service import (
+    email_dispatcher, email_templates, generate_verification_token, send_verification_email, send_welcome_email
+)
 from app.schemas.schemas import EmailVerificationRequest, ResendVerificationRequest
+from app.schemas.schemas import BulkUserProvisionRequest, BulkUserProvisionResponse, BulkUserResult
+from app.schemas.schemas import LogoutRequest, TokenRefreshRequest
 import os
+import mimetypes
 from typing import Dict, Optional, List, Any
 from pydantic import BaseModel
 import logging
 import uuid
+import time
+import asyncio
+import math
 from datetime import datetime
 from sqlalchemy.exc import IntegrityError
 from app.schemas.schemas import UserRole
@@ -49,6 +77,7 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(MetricsMiddleware)
 
 FRONTEND_URL = os.getenv('FRONTEND_URL', 'http://localhost:3000')
 # Route prefixes and their corresponding services
@@ -60,6 +89,10 @@ ROUTE_SERVICES = {
     'data-source': os.getenv('DATA_SOURCE_SERVICE_URL', 'http://narrative:8000'),
     'metric-discovery': os.getenv('METRIC_DISCOVERY_SERVICE_URL', 'http://metric-discovery:8000')
 }
+# Longest-prefix lookup table compiled once from ROUTE_SERVICES
+route_table = RouteTable(ROUTE_SERVICES)
+health_monitor = create_health_monitor(ROUTE_SERVICES)
+response_cache = create_response_cache()
 
 oauth2_scheme = OAuth2PasswordBearer(
     tokenUrl="authorization/login",
@@ -143,8 +176,64 @@ async def validate_config():
     for service, url in ROUTE_SERVICES.items():
         logger.info(f"{service}: {url or 'NOT CONFIGURED'}")
 
+    if settings.GATEWAY_STREAMING and settings.GATEWAY_RESPONSE_CACHE_ENABLED:
+        logger.warning("GATEWAY_RESPONSE_CACHE_ENABLED has no effect while GATEWAY_STREAMING is on")
+
+@app.on_event("startup")
+async def start_service_clients():
+    """Open pooled upstream clients once per worker"""
+    await service_clients.startup(ROUTE_SERVICES)
+
+@app.on_event("startup")
+async def start_health_monitor():
+    """Start background upstream health probes"""
+    health_monitor.start()
+
+@app.on_event("startup")
+async def start_revocation_store():
+    """Start pruning (or, with Redis, syncing) revoked token ids"""
+    workers = int(os.environ.get("WEB_CONCURRENCY") or 1)
+    if workers > 1 and not settings.REDIS_URL:
+        logger.error(
+            f"REDIS_URL is not set but {workers} workers are running: each keeps its own revoked tokens, "
+            "so logged-out and rotated refresh tokens are still accepted by the other workers"
+        )
+    revocation_store.start()
+
+@app.on_event("startup")
+async def start_email_dispatcher():
+    """Compile email templates and start background delivery workers"""
+    email_templates.preload()
+    email_dispatcher.start()
+
+@app.on_event("shutdown")
+async def stop_health_monitor():
+    """Stop health probes before the pooled clients are closed"""
+    await health_monitor.stop()
+
+@app.on_event("shutdown")
+async def close_service_clients():
+    """Drain in-flight proxied requests, then close pooled upstream clients and connectors"""
+    await service_clients.drain(settings.GATEWAY_DRAIN_TIMEOUT_SECONDS)
+    await service_clients.shutdown()
+    await async_connectors.close_all()
+
+@app.on_event("shutdown")
+async def stop_email_dispatcher():
+    """Deliver queued emails before the worker exits"""
+    await email_dispatcher.stop()
+
+@app.on_event("shutdown")
+async def stop_revocation_store():
+    await revocation_store.stop()
+
+@app.on_event("shutdown")
+async def stop_password_hasher():
+    """Stop the bcrypt worker pool on shutdown"""
+    password_hasher.shutdown()
+
 @app.get("/debug/config")
-async def debug_config(current_user: Dict = Depends(get_current_user)):
+async def debug_config(current_user: Dict = Depends(get_current_principal)):
     """Debug endpoint for configuration status"""
     if not current_user["user"].is_admin:
         raise HTTPException(status_code=403, detail="Admin access required")
@@ -170,41 +259,14 @@ async def debug_config(current_user: Dict = Depends(get_current_user)):
     }
 
 @app.get("/debug/services")
-async def debug_services(current_user: Dict = Depends(get_current_user)):
+async def debug_services(current_user: Dict = Depends(get_current_principal)):
     """Debug endpoint for service status"""
     if not current_user["user"].is_admin:
         raise HTTPException(status_code=403, detail="Admin access required")
         
-    service_status = {}
-    for service_name, service_url in ROUTE_SERVICES.items():
-        try:
-            if service_url:
-                async with httpx.AsyncClient(timeout=5.0) as client:
-                    try:
-                        response = await client.get(f"{service_url}/health")
-                        is_healthy = response.status_code == 200
-                    except Exception as e:
-                        logger.error(f"Health check failed for {service_name}: {str(e)}")
-                        is_healthy = False
-            else:
-                is_healthy = False
-                
-            service_status[service_name] = {
-                "url": service_url,
-                "configured": bool(service_url),
-                "healthy": is_healthy,
-                "error": None if is_healthy else "Service not reachable"
-            }
-        except Exception as e:
-            service_status[service_name] = {
-                "url": service_url,
-                "configured": bool(service_url),
-                "healthy": False,
-                "error": str(e)
-            }
-    
     return {
-        "services": service_status,
+        "services": health_monitor.snapshot(),
+        "circuits": circuit_breakers.snapshot(),
         "user_context": {
             "user_id": current_user["user"].id,
             "role": current_user["user"].role,
@@ -215,15 +277,30 @@ async def debug_services(current_user: Dict = Depends(get_current_user)):
 # Add health check endpoint directly to gateway
 @app.get("/health")
 async def gateway_health():
-    """Gateway health check endpoint"""
+    """Gateway health check endpoint, with upstream status from the probe table"""
     return {
-        "status": "healthy",
+        "status": health_monitor.overall_status,
         "service": "gateway",
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": datetime.utcnow().isoformat(),
+        "upstreams": {
+            name: {"healthy": status["healthy"], "latency_ms": status["latency_ms"]}
+            for name, status in health_monitor.snapshot().items()
+        }
     }
 
+@app.get("/metrics", include_in_schema=False)
+async def gateway_metrics():
+    """Prometheus metrics for the gateway and its upstream services"""
+    return Response(content=render_metrics(), media_type=CONTENT_TYPE_LATEST)
+
 def get_full_data_access():
-    return "all_departments,all_locations,all_products,financial_data,customer_data,marketing_data,sales_data,employee_data,historical_data,forecasts,system_config,audit_logs"
+    return FULL_DATA_ACCESS
+
+def resolve_data_access(data_access: Optional[str]) -> str:
+    """Requested data access, with full/all/everything (or nothing) meaning full access"""
+    if data_access is None or data_access.lower() in ["full", "all", "everything"]:
+        return get_full_data_access()
+    return data_access
 
 @app.post("/authorization/signup", response_model=UserSchema)
 async def signup(user: UserCreate, db: Session = Depends(get_db)):
@@ -235,13 +312,9 @@ async def signup(user: UserCreate, db: Session = Depends(get_db)):
     if username_exists:
         raise HTTPException(status_code=400, detail="Username already taken")
     
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await aget_password_hash(user.password)
     
-    # Determine data access
-    if user.data_access is None or user.data_access.lower() in ["full", "all", "everything"]:
-        data_access = get_full_data_access()
-    else:
-        data_access = user.data_access
+    data_access = resolve_data_access(user.data_access)
     
     # Check if organization exists, if not, create it
     org = db.query(Organization).filter(Organization.name == "Wayne Enterprise").first()
@@ -344,8 +417,13 @@ async def resend_verification(
     return {"message": "Verification email sent"}
 
 @app.post("/authorization/login", response_model=Token)
-async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == form_data.username).first()
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
+    result = await db.execute(
+        select(User)
+        .options(selectinload(User.organizations))
+        .where(User.email == form_data.username)
+    )
+    user = result.scalars().first()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -353,7 +431,7 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session =
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    if not verify_password(form_data.password, user.hashed_password):
+    if not await averify_password(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -374,10 +452,52 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session =
     # For simplicity, we're using the first organization. In a real-world scenario,
     # you might want to let the user choose which organization to log into
     
-    access_token = create_access_token(
-        data={"sub": user.email, "org_id": user.organizations[0].id if user.organizations else None}
+    token_data = {"sub": user.email, "org_id": user.organizations[0].id if user.organizations else None}
+    access_token = create_access_token(data=token_data, user=user)
+    return {
+        "access_token": access_token,
+        "refresh_token": create_refresh_token(token_data),
+        "token_type": "bearer"
+    }
+
+@app.post("/authorization/refresh", response_model=Token)
+async def refresh_access_token(request_data: TokenRefreshRequest, db: AsyncSession = Depends(get_async_db)):
+    """Exchange a refresh token for a new access/refresh pair; the used refresh token is revoked"""
+    payload = decode_refresh_token(request_data.refresh_token)
+    result = await db.execute(
+        select(User)
+        .options(selectinload(User.organizations))
+        .where(User.email == payload["sub"])
     )
-    return {"access_token": access_token, "token_type": "bearer"}
+    user = result.scalars().first()
+    org_id = payload.get("org_id")
+    if not user or not user.is_active or org_id not in {org.id for org in user.organizations}:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    # Rotate: a refresh token can be used once, so only the request that
+    # revokes it gets a new pair; a concurrent replay loses the race
+    if not await revoke_token(payload):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    token_data = {"sub": user.email, "org_id": org_id}
+    return {
+        "access_token": create_access_token(data=token_data, user=user),
+        "refresh_token": create_refresh_token(token_data),
+        "token_type": "bearer"
+    }
+
+@app.post("/authorization/logout")
+async def logout(request_data: Optional[LogoutRequest] = None, token: str = Depends(oauth2_scheme)):
+    """Revoke the presented access token and, if given, the matching refresh token"""
+    await revoke_tokens(token, request_data.refresh_token if request_data else None)
+    return {"message": "Logged out"}
 
 @app.get("/authorization/me", response_model=UserSchema)
 async def get_current_user_info(current_user: dict = Depends(get_current_user)):
@@ -400,18 +520,23 @@ async def switch_organization(
     if not org:
         raise HTTPException(status_code=404, detail="Organization not found")
     
-    if org not in user.organizations:
+    if org.id not in {user_org.id for user_org in user.organizations}:
         raise HTTPException(status_code=403, detail=f"User is not a member of organization {org_id}")
     
-    access_token = create_access_token(data={"sub": user.email, "org_id": org_id})
-    return {"access_token": access_token, "token_type": "bearer"}
+    token_data = {"sub": user.email, "org_id": org_id}
+    access_token = create_access_token(data=token_data, user=user)
+    return {
+        "access_token": access_token,
+        "refresh_token": create_refresh_token(token_data),
+        "token_type": "bearer"
+    }
 
 @app.post("/authorization/user/{user_id}/add-organization/{org_id}")
 async def add_user_to_organization(
     user_id: int,
     org_id: int,
     db: Session = Depends(get_db),
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_principal)
 ):
     if not current_user["user"].is_admin:
         raise HTTPException(status_code=403, detail="Only admins can add users to organizations")
@@ -431,29 +556,282 @@ async def add_user_to_organization(
     else:
         return {"message": f"User {user.username} is already a member of organization {org.name}"}
 
+@app.post("/authorization/organization/{org_id}/users/bulk", response_model=BulkUserProvisionResponse)
+async def bulk_provision_users(
+    org_id: int,
+    request_data: BulkUserProvisionRequest,
+    current_user: dict = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Create a batch of users and add them to an organization in one
+    transaction. Users whose email is already registered are only added to
+    the organization. Every row gets its own result; invalid rows are
+    reported without failing the rest of the batch.
+    """
+    if not current_user["user"].is_admin:
+        raise HTTPException(status_code=403, detail="Only admins can provision users")
+
+    rows = request_data.users
+    if len(rows) > settings.BULK_PROVISION_MAX_USERS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.BULK_PROVISION_MAX_USERS} users can be provisioned per request"
+        )
+
+    org = await db.scalar(select(Organization.id).where(Organization.id == org_id))
+    if org is None:
+        raise HTTPException(status_code=404, detail="Organization not found")
+
+    # One round trip for every duplicate check
+    existing = await db.execute(
+        select(User.id, User.email, User.username).where(
+            User.email.in_({row.email for row in rows}) | User.username.in_({row.username for row in rows})
+        )
+    )
+    users_by_email = {}
+    taken_usernames = set()
+    for existing_user in existing:
+        users_by_email[existing_user.email] = existing_user.id
+        taken_usernames.add(existing_user.username)
+
+    members = set()
+    if users_by_email:
+        members = set((await db.scalars(
+            select(user_organizations.c.user_id).where(
+                user_organizations.c.organization_id == org_id,
+                user_organizations.c.user_id.in_(users_by_email.values())
+            )
+        )).all())
+
+    results: List[Optional[BulkUserResult]] = [None] * len(rows)
+    new_users = []
+    memberships = []
+    seen_emails = set()
+    for index, row in enumerate(rows):
+        error = None
+        if row.org_role not in ("admin", "member"):
+            error = f"Invalid organization role '{row.org_role}'"
+        elif row.email in seen_emails:
+            error = "Duplicate email in batch"
+        if error:
+            results[index] = BulkUserResult(index=index, email=row.email, status="error", detail=error)
+            continue
+        seen_emails.add(row.email)
+
+        user_id = users_by_email.get(row.email)
+        if user_id is not None:
+            if user_id in members:
+                status_label = "already_member"
+            else:
+                status_label = "added"
+                members.add(user_id)
+                memberships.append({"user_id": user_id, "organization_id": org_id, "role": row.org_role})
+            results[index] = BulkUserResult(index=index, email=row.email, status=status_label, user_id=user_id)
+        elif row.username in taken_usernames:
+            results[index] = BulkUserResult(index=index, email=row.email, status="error", detail="Username already taken")
+        else:
+            taken_usernames.add(row.username)
+            new_users.append((index, row))
+
+    hashed_passwords = await asyncio.gather(*(aget_password_hash(row.password) for _, row in new_users))
+
+    try:
+        created_ids = {}
+        if new_users:
+            inserted = await db.execute(
+                insert(User).returning(User.id, User.email),
+                [
+                    {
+                        "username": row.username,
+                        "email": row.email,
+                        "hashed_password": hashed_password,
+                        "role": row.role,
+                        "data_access": resolve_data_access(row.data_access),
+                        "is_active": True,
+                        "is_admin": row.role.lower() in ["admin", "ceo"],
+                        "is_verified": True
+                    } for (_, row), hashed_password in zip(new_users, hashed_passwords)
+                ]
+            )
+            created_ids = {created.email: created.id for created in inserted}
+        for index, row in new_users:
+            user_id = created_ids[row.email]
+            memberships.append({"user_id": user_id, "organization_id": org_id, "role": row.org_role})
+            results[index] = BulkUserResult(index=index, email=row.email, status="created", user_id=user_id)
+        if memberships:
+            await db.execute(insert(user_organizations), memberships)
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        logger.error(f"Bulk provisioning for organization {org_id} conflicted: {str(e)}")
+        raise HTTPException(
+            status_code=409,
+            detail="Users or memberships were changed concurrently; nothing was provisioned, retry the batch"
+        )
+
+    # Memberships were written without the ORM relationship events
+    token_cache.invalidate_users(
+        result.user_id for result in results if result.status == "added"
+    )
+
+    counts = {label: 0 for label in ("created", "added", "already_member", "error")}
+    for result in results:
+        counts[result.status] += 1
+    logger.info(f"Bulk provisioned organization {org_id}: {counts}")
+    return BulkUserProvisionResponse(
+        organization_id=org_id,
+        created=counts["created"],
+        added=counts["added"],
+        already_member=counts["already_member"],
+        failed=counts["error"],
+        results=results
+    )
+
+CHAT_HISTORY_BATCH_SIZE = 200
+DOCUMENT_CHUNK_BYTES = 1024 * 1024
+
+def chat_history_query(user_id: int, session_id: uuid.UUID, cursor: Optional[str] = None):
+    """Interaction columns for a session, oldest first, without the document blobs"""
+    statement = select(
+        InteractionHistory.id,
+        InteractionHistory.question,
+        InteractionHistory.answer,
+        InteractionHistory.timestamp,
+        InteractionHistory.document_filename,
+        InteractionHistory.document_type,
+        InteractionHistory.original_document.isnot(None).label('has_document')
+    ).where(
+        InteractionHistory.user_id == user_id,
+        InteractionHistory.session_id == session_id
+    ).order_by(*keyset_order(InteractionHistory.timestamp, InteractionHistory.id))
+    if cursor:
+        timestamp, interaction_id = decode_cursor(cursor, datetime, int)
+        statement = statement.where(
+            keyset_after(InteractionHistory.timestamp, InteractionHistory.id, timestamp, interaction_id)
+        )
+    return statement
+
 @app.get("/authorization/chat-history/{session_id}", response_model=List[ChatHistoryResponse])
 async def get_chat_history(
-    session_id: str,
-    current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    session_id: uuid.UUID,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Page size; the whole session when omitted"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    current_user: dict = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    chat_history = db.query(InteractionHistory).filter(
-        InteractionHistory.user_id == current_user["user"].id,
-        InteractionHistory.session_id == session_id
-    ).order_by(InteractionHistory.timestamp).all()
+    """Chat history for a session, oldest first; sets X-Next-Cursor while more pages remain"""
+    statement = chat_history_query(current_user["user"].id, session_id, cursor)
+    if limit is not None:
+        statement = statement.limit(limit + 1)
+    result = await db.execute(statement)
+    rows = result.all()
+
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        response.headers['X-Next-Cursor'] = encode_cursor(rows[-1].timestamp, rows[-1].id)
 
     return [
         ChatHistoryResponse(
-            question=interaction.question,
-            answer=interaction.answer,
-            timestamp=interaction.timestamp
-        ) for interaction in chat_history
+            question=row.question,
+            answer=row.answer,
+            timestamp=row.timestamp
+        ) for row in rows
     ]
 
+async def stream_chat_history(statement):
+    """Run the query on its own session and yield interactions in batches"""
+    async with AsyncSessionLocal() as session:
+        result = await session.stream(statement.execution_options(yield_per=CHAT_HISTORY_BATCH_SIZE))
+        async for rows in result.partitions():
+            yield [
+                {
+                    'id': row.id,
+                    'question': row.question,
+                    'answer': row.answer,
+                    'timestamp': row.timestamp.isoformat() if row.timestamp else None,
+                    'document': {
+                        'filename': row.document_filename,
+                        'type': row.document_type
+                    } if row.has_document else None
+                } for row in rows
+            ]
+
+@app.get("/authorization/chat-history/{session_id}/stream")
+async def stream_chat_history_ndjson(
+    session_id: uuid.UUID,
+    cursor: Optional[str] = Query(None, description="Resume after this cursor"),
+    current_user: dict = Depends(get_current_principal)
+):
+    """
+    Chat history for a session as newline-delimited JSON, one interaction per
+    line. Attached documents are only described; fetch them from
+    /authorization/chat-history/{session_id}/documents/{interaction_id}.
+    """
+    statement = chat_history_query(current_user["user"].id, session_id, cursor)
+    return StreamingResponse(
+        stream_ndjson(stream_chat_history(statement)),
+        media_type="application/x-ndjson"
+    )
+
+async def stream_document(interaction_id: int, size: int):
+    """
+    Read a stored document in chunks so the blob is never held in memory whole.
+    Each chunk only reads its own TOAST slices because the column is stored
+    EXTERNAL (deployment/migrations/002); a compressed value would be
+    decompressed whole for every chunk.
+    """
+    async with AsyncSessionLocal() as session:
+        for offset in range(0, size, DOCUMENT_CHUNK_BYTES):
+            result = await session.execute(
+                select(
+                    func.substr(InteractionHistory.original_document, offset + 1, DOCUMENT_CHUNK_BYTES)
+                ).where(InteractionHistory.id == interaction_id)
+            )
+            chunk = result.scalar()
+            if not chunk:
+                break
+            yield bytes(chunk)
+
+@app.get("/authorization/chat-history/{session_id}/documents/{interaction_id}")
+async def get_chat_document(
+    session_id: uuid.UUID,
+    interaction_id: int,
+    current_user: dict = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Stream the original document attached to one of the caller's interactions"""
+    result = await db.execute(
+        select(
+            func.length(InteractionHistory.original_document).label('size'),
+            InteractionHistory.document_filename,
+            InteractionHistory.document_type
+        ).where(
+            InteractionHistory.id == interaction_id,
+            InteractionHistory.user_id == current_user["user"].id,
+            InteractionHistory.session_id == session_id
+        )
+    )
+    document = result.first()
+    if document is None or document.size is None:
+        raise HTTPException(status_code=404, detail="Document not found")
+
+    filename = document.document_filename or f"document.{document.document_type or 'bin'}"
+    media_type = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    return StreamingResponse(
+        stream_document(interaction_id, document.size),
+        media_type=media_type,
+        headers={
+            'Content-Length': str(document.size),
+            'Content-Disposition': f'attachment; filename="{filename}"'
+        }
+    )
+
 @app.post("/authorization/like/{article_id}", response_model=LikedPostResponse)
 async def like_post(
     article_id: uuid.UUID,
-    current_user: dict = Depends(get_current_user),
+    current_user: dict = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     article = db.query(Article).filter(Article.id == article_id).first()
@@ -473,7 +851,7 @@ async def like_post(
 @app.delete("/authorization/unlike/{article_id}", response_model=LikedPostResponse)
 async def unlike_post(
     article_id: uuid.UUID,
-    current_user: dict = Depends(get_current_user),
+    current_user: dict = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     liked_post = db.query(LikedPost).filter(
@@ -513,59 +891,122 @@ async def get_user_org_role(
         role=role
     )
 
-@app.get("/authorization/liked-posts", response_model=List[NewsArticle])
+# Article columns the liked-posts endpoint can project, in response order
+LIKED_POST_FIELDS = ('title', 'content', 'category', 'time_period', 'graph_data')
+LIKED_POSTS_BATCH_SIZE = 100
+
+def graph_data_payload(graph_data: Optional[Dict]) -> Dict[str, Dict]:
+    """Stored article graph data in the GraphData response shape"""
+    payload = {}
+    for metric_name, data in (graph_data or {}).items():
+        visualization = None
+        if 'visualization' in data:
+            stored = data['visualization']
+            visualization = {
+                'type': stored.get('type', 'line'),
+                'axis_label': stored.get('axis_label', 'Value'),
+                'value_format': stored.get('value_format', {}),
+                'show_points': stored.get('show_points', True),
+                'stack_type': stored.get('stack_type'),
+                'show_labels': stored.get('show_labels', True)
+            }
+        payload[metric_name] = {
+            'current': float(data.get('current', 0)),
+            'previous': float(data.get('previous', 0)),
+            'change': float(data.get('change', 0)),
+            'change_percentage': float(data.get('change_percentage', 0)),
+            'visualization': visualization
+        }
+    return payload
+
+def liked_article_payload(row, fields) -> Dict[str, Any]:
+    item = {'id': str(row.id)}
+    for field in fields:
+        if field == 'graph_data':
+            item['graph_data'] = graph_data_payload(row.graph_data)
+        else:
+            item[field] = getattr(row, field)
+    if fields == LIKED_POST_FIELDS:
+        item['context'] = None
+    return item
+
+async def stream_liked_articles(statement, fields):
+    """Run the query on its own session and yield converted rows in batches"""
+    async with AsyncSessionLocal() as session:
+        result = await session.stream(statement.execution_options(yield_per=LIKED_POSTS_BATCH_SIZE))
+        async for rows in result.partitions():
+            yield [liked_article_payload(row, fields) for row in rows]
+
+async def batch_liked_articles(rows, fields):
+    for i in range(0, len(rows), LIKED_POSTS_BATCH_SIZE):
+        yield [liked_article_payload(row, fields) for row in rows[i:i + LIKED_POSTS_BATCH_SIZE]]
+
+def liked_posts_query(user_id: int, org_id: int, fields=LIKED_POST_FIELDS, cursor: Optional[str] = None):
+    """A user's liked articles in one organization, most recently liked first"""
+    statement = select(
+        Article.id,
+        *(getattr(Article, field) for field in fields),
+        LikedPost.liked_at,
+        LikedPost.id.label('like_id')
+    ).join(
+        LikedPost,
+        LikedPost.article_id == Article.id
+    ).where(
+        LikedPost.user_id == user_id,
+        Article.organization_id == org_id
+    ).order_by(*keyset_order(LikedPost.liked_at, LikedPost.id, descending=True))
+    if cursor:
+        liked_at, like_id = decode_cursor(cursor, datetime, int)
+        statement = statement.where(keyset_after(LikedPost.liked_at, LikedPost.id, liked_at, like_id, descending=True))
+    return statement
+
+@app.get(
+    "/authorization/liked-posts",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "model": List[NewsArticle],
+            "description": "JSON array of articles, limited to `id` and the requested `fields`",
+            "headers": {"X-Next-Cursor": {"description": "Cursor for the next page, set while more remain"}}
+        }
+    }
+)
 async def get_liked_posts(
-    current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size; all liked posts when omitted"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated article fields, e.g. 'title,category'"),
+    current_user: dict = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get all liked posts with full article data."""
-    try:
-        # Get liked posts with article data in a single query using join
-        liked_articles = db.query(Article).join(
-            LikedPost, 
-            LikedPost.article_id == Article.id
-        ).filter(
-            LikedPost.user_id == current_user["user"].id,
-            Article.organization_id == current_user["current_org_id"]
-        ).all()
-
-        # Convert to NewsArticle format
-        articles = []
-        for article in liked_articles:
-            # Convert stored graph data to proper format
-            graph_data = {}
-            if article.graph_data:
-                for metric_name, data in article.graph_data.items():
-                    visualization = None
-                    if 'visualization' in data:
-                        visualization = Visualization(
-                            type=data['visualization'].get('type', 'line'),
-                            axis_label=data['visualization'].get('axis_label', 'Value'),
-                            value_format=data['visualization'].get('value_format', {}),
-                            show_points=data['visualization'].get('show_points', True),
-                            stack_type=data['visualization'].get('stack_type'),
-                            show_labels=data['visualization'].get('show_labels', True)
-                        )
-
-                    graph_data[metric_name] = GraphData(
-                        current=float(data.get('current', 0)),
-                        previous=float(data.get('previous', 0)),
-                        change=float(data.get('change', 0)),
-                        change_percentage=float(data.get('change_percentage', 0)),
-                        visualization=visualization
-                    )
-
-            articles.append(NewsArticle(
-                id=str(article.id),
-                title=article.title,
-                content=article.content,
-                category=article.category,
-                time_period=article.time_period,
-                graph_data=graph_data
-            ))
-
-        return articles
+    """
+    Get liked posts, most recently liked first, streamed as a JSON array.
+    With `limit` only one page is returned and the X-Next-Cursor header is set
+    while more remain. `fields` selects the article columns to load, so
+    `content` and `graph_data` can be skipped for list views.
+    """
+    if fields:
+        requested = {field.strip() for field in fields.split(',') if field.strip()}
+        unknown = requested - set(LIKED_POST_FIELDS) - {'id'}
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown fields: {sorted(unknown)}. Available: {list(LIKED_POST_FIELDS)}"
+            )
+        selected = tuple(field for field in LIKED_POST_FIELDS if field in requested)
+    else:
+        selected = LIKED_POST_FIELDS
 
+    statement = liked_posts_query(current_user["user"].id, current_user["current_org_id"], selected, cursor)
+
+    if limit is None:
+        return StreamingResponse(
+            stream_json_array(stream_liked_articles(statement, selected)),
+            media_type="application/json"
+        )
+
+    try:
+        result = await db.execute(statement.limit(limit + 1))
+        rows = result.all()
     except Exception as e:
         logger.error(f"Error fetching liked posts: {str(e)}")
         raise HTTPException(
@@ -573,11 +1014,21 @@ async def get_liked_posts(
             detail=f"Error fetching liked posts: {str(e)}"
         )
 
+    headers = {}
+    if len(rows) > limit:
+        rows = rows[:limit]
+        headers['X-Next-Cursor'] = encode_cursor(rows[-1].liked_at, rows[-1].like_id)
+    return StreamingResponse(
+        stream_json_array(batch_liked_articles(rows, selected)),
+        media_type="application/json",
+        headers=headers
+    )
+
 @app.post("/authorization/find-by-email", response_model=UserResponse)
 async def find_user_by_email(
     email_data: EmailRequest,
     db: Session = Depends(get_db),
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_principal)
 ):
     if not current_user["user"].is_admin:
         raise HTTPException(status_code=403, detail="Only admins can look up users")
@@ -588,25 +1039,42 @@ async def find_user_by_email(
     
     return user
     
-async def check_service_health(service_url: str) -> bool:
-    """Check if a service is reachable"""
-    if not service_url:
+HOP_BY_HOP_HEADERS = {
+    'connection', 'keep-alive', 'proxy-authenticate', 'proxy-authorization',
+    'te', 'trailer', 'transfer-encoding', 'upgrade'
+}
+
+def should_stream_request_body(request: Request) -> bool:
+    """Stream large or unsized request bodies upstream instead of buffering them"""
+    if not settings.GATEWAY_STREAMING:
         return False
-        
+    content_length = request.headers.get('content-length')
+    if content_length is None or not content_length.isdigit():
+        return True
+    return int(content_length) >= settings.GATEWAY_STREAM_REQUEST_MIN_BYTES
+
+async def relay_upstream_stream(response: httpx.Response, service_label: str):
+    """
+    Relay a streamed upstream body. The upstream connection is released however
+    the relay ends: completed, client disconnected or upstream failed mid-body.
+    """
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"{service_url}/health", timeout=5.0)
-            return response.status_code == 200
-    except Exception as e:
-        logger.error(f"Health check failed for {service_url}: {str(e)}")
-        return False
-    
+        async for chunk in count_upstream_bytes(response.aiter_raw(), service_label):
+            yield chunk
+    finally:
+        try:
+            await response.aclose()
+        finally:
+            service_clients.request_finished()
+
 async def forward_request(
     request: Request,
     service_url: str,
     path: str,
     current_user: Optional[Dict] = None,
-    method: Optional[str] = None
+    method: Optional[str] = None,
+    service_name: Optional[str] = None,
+    extra_headers: Optional[Dict[str, str]] = None
 ):
     """Forward request to microservice with enhanced path handling"""
     try:
@@ -620,12 +1088,17 @@ async def forward_request(
         logger.info(f"Forwarding {request_method} request to: {full_url}")
         
         # Get request body only for methods that should have one
-        body = await request.body() if request_method in ['POST', 'PUT', 'PATCH'] else None
+        stream_body = request_method in ['POST', 'PUT', 'PATCH'] and should_stream_request_body(request)
+        if stream_body:
+            body = request.stream()
+        else:
+            body = await request.body() if request_method in ['POST', 'PUT', 'PATCH'] else None
         
         # Prepare headers with user context
         headers = dict(request.headers)
         headers.pop('host', None)
-        headers.pop('content-length', None)
+        if not stream_body:
+            headers.pop('content-length', None)
         
         if current_user:
             headers.update({
@@ -635,307 +1108,266 @@ async def forward_request(
                 'X-User-Data-Access': current_user['user'].data_access or ''
             })
             logger.debug(f"Request headers: {headers}")
+        if extra_headers:
+            headers.update(extra_headers)
         
         # Special handling for health check
         if path.lower() == '/health':
             request_method = 'GET'
         
-        async with httpx.AsyncClient(timeout=60.0, follow_redirects=True) as client:
-            try:
-                logger.debug(f"Making request: {request_method} {full_url}")
-                logger.debug(f"Query params: {request.query_params}")
-                
-                response = await client.request(
-                    method=request_method,
-                    url=full_url,
-                    content=body,
-                    headers=headers,
-                    params=request.query_params
-                )
-                
-                logger.info(f"Service response status: {response.status_code}")
-                logger.debug(f"Response headers: {response.headers}")
-                
-                # Check if response is PDF
-                content_type = response.headers.get('content-type', '')
-                if 'application/pdf' in content_type:
-                    return Response(
-                        content=response.content,
-                        status_code=response.status_code,
-                        media_type='application/pdf',
-                        headers={
-                            'Content-Type': 'application/pdf',
-                            'Content-Disposition': response.headers.get('content-disposition', 'attachment; filename="document.pdf"')
-                        }
-                    )
-                
-                # Handle other responses as JSON
-                return JSONResponse(
-                    content=response.json() if response.text else {},
+        service_label = service_name or 'unknown'
+        breaker = circuit_breakers.get(service_label)
+        if not breaker.allow_request():
+            # Fail fast instead of pinning a worker on a sick upstream
+            UPSTREAM_ERRORS.labels(service=service_label, reason="circuit_open").inc()
+            raise HTTPException(
+                status_code=503,
+                detail=f"Service '{service_label}' is temporarily unavailable",
+                headers={"Retry-After": str(math.ceil(breaker.retry_after()) or 1)}
+            )
+        
+        client = service_clients.get(service_name)
+        started = time.perf_counter()
+        outcome_recorded = False
+        stream_handed_off = False
+        UPSTREAM_IN_FLIGHT.labels(service=service_label).inc()
+        service_clients.request_started()
+        try:
+            logger.debug(f"Making request: {request_method} {full_url}")
+            logger.debug(f"Query params: {request.query_params}")
+            
+            upstream_request = client.build_request(
+                method=request_method,
+                url=full_url,
+                content=body,
+                headers=headers,
+                params=request.query_params
+            )
+            if isinstance(body, bytes):
+                UPSTREAM_REQUEST_BYTES.labels(service=service_label).inc(len(body))
+            elif stream_body and headers.get('content-length', '').isdigit():
+                UPSTREAM_REQUEST_BYTES.labels(service=service_label).inc(int(headers['content-length']))
+            response = await client.send(upstream_request, stream=settings.GATEWAY_STREAMING)
+            
+            UPSTREAM_LATENCY.labels(
+                service=service_label,
+                method=request_method,
+                status=status_class(response.status_code)
+            ).observe(time.perf_counter() - started)
+            if response.status_code >= 500:
+                UPSTREAM_ERRORS.labels(service=service_label, reason=f"http_{response.status_code}").inc()
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            outcome_recorded = True
+            logger.info(f"Service response status: {response.status_code}")
+            logger.debug(f"Response headers: {response.headers}")
+            
+            # Relay the raw upstream bytes without decoding the payload
+            if settings.GATEWAY_STREAMING:
+                stream_handed_off = True
+                return StreamingResponse(
+                    relay_upstream_stream(response, service_label),
                     status_code=response.status_code,
                     headers={
                         k: v for k, v in response.headers.items()
-                        if k.lower() not in ('content-length', 'transfer-encoding')
+                        if k.lower() not in HOP_BY_HOP_HEADERS
                     }
                 )
-                
-            except httpx.RequestError as e:
-                logger.error(f"Request to service failed: {str(e)}")
-                raise HTTPException(
-                    status_code=503,
-                    detail=f"Service unavailable: {str(e)}"
+            
+            UPSTREAM_RESPONSE_BYTES.labels(service=service_label).inc(len(response.content))
+            
+            # Check if response is PDF
+            content_type = response.headers.get('content-type', '')
+            if 'application/pdf' in content_type:
+                return Response(
+                    content=response.content,
+                    status_code=response.status_code,
+                    media_type='application/pdf',
+                    headers={
+                        'Content-Type': 'application/pdf',
+                        'Content-Disposition': response.headers.get('content-disposition', 'attachment; filename="document.pdf"')
+                    }
                 )
             
-    except Exception as e:
-        logger.exception(f"Error in forward_request: {str(e)}")
-        if isinstance(e, HTTPException):
-            raise e
-        raise HTTPException(status_code=500, detail=str(e))
-
-async def get_service_url(prefix: str) -> str:
-    """Get service URL and validate prefix"""
-    service_url = ROUTE_SERVICES.get(prefix)
-    if not service_url:
-        available_services = list(ROUTE_SERVICES.keys())
-        logger.error(f"Service not found for prefix '{prefix}'. Available: {available_services}")
-        raise HTTPException(
-            status_code=404,
-            detail=f"Service '{prefix}' not found. Available services: {available_services}"
-        )
-    return service_url
-
-@app.get(
-    "/{prefix}/{path:path}",
-    summary="Gateway router for GET requests",
-    description="Routes GET requests to appropriate microservices"
-)
-async def gateway_router_get(
-    prefix: str,
-    path: str,
-    request: Request,
-    current_user: Dict = Depends(get_current_user)
-):
-    """Gateway router for GET requests with enhanced path handling"""
-    try:
-        # Handle different URL encoding scenarios
-        decoded_prefix = unquote(prefix).replace('%2F', '/')
-        decoded_path = unquote(path).replace('%2F', '/')
-        
-        combined_prefix = None
-        path_segments = decoded_path.split('/')
-        if path_segments:
-            combined_prefix = f"{decoded_prefix}/{path_segments[0]}"
+            # Handle other responses as JSON
+            return JSONResponse(
+                content=response.json() if response.text else {},
+                status_code=response.status_code,
+                headers={
+                    k: v for k, v in response.headers.items()
+                    if k.lower() not in ('content-length', 'transfer-encoding')
+                }
+            )
             
-        # First try the combined prefix, then fall back to original prefix
-        service_url = (
-            ROUTE_SERVICES.get(combined_prefix) or 
-            ROUTE_SERVICES.get(decoded_prefix) or 
-            ROUTE_SERVICES.get(decoded_prefix.lower())
-        )
-        
-        if not service_url:
-            available_services = list(ROUTE_SERVICES.keys())
+        except httpx.RequestError as e:
+            UPSTREAM_ERRORS.labels(service=service_label, reason=type(e).__name__).inc()
+            if not outcome_recorded:
+                breaker.record_failure()
+                outcome_recorded = True
+            logger.error(f"Request to service failed: {str(e)}")
             raise HTTPException(
-                status_code=404,
-                detail=f"Service '{decoded_prefix}' not found. Available services: {available_services}"
+                status_code=503,
+                detail=f"Service unavailable: {str(e)}"
             )
-        
-        # Adjust the forward path based on whether we used the combined prefix
-        if combined_prefix and service_url == ROUTE_SERVICES.get(combined_prefix):
-            # Remove the first path segment since it's part of the prefix
-            forward_path = '/' + '/'.join(path_segments[1:])
-        else:
-            forward_path = '/' + decoded_path
-            
-        # Clean and normalize the path
-        forward_path = forward_path.rstrip('/')
-        if not forward_path:
-            forward_path = '/'
-        
-        return await forward_request(
-            request=request,
-            service_url=service_url,
-            path=forward_path,
-            current_user=current_user,
-            method="GET"  # Explicitly set method
-        )
+        finally:
+            UPSTREAM_IN_FLIGHT.labels(service=service_label).dec()
+            if not outcome_recorded:
+                breaker.release()
+            if not stream_handed_off:
+                service_clients.request_finished()
         
     except Exception as e:
-        logger.exception(f"Error in GET router: {str(e)}")
+        logger.exception(f"Error in forward_request: {str(e)}")
         if isinstance(e, HTTPException):
             raise e
-        raise HTTPException(status_code=500, detail=f"Gateway GET error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/{prefix}/{path:path}")
-async def gateway_router_post(
-    prefix: str,
-    path: str,
+async def forward_cached_request(
     request: Request,
-    current_user: Dict = Depends(get_current_user)
+    service_name: str,
+    service_url: str,
+    path: str,
+    current_user: Optional[Dict] = None
 ):
-    """Gateway router for POST requests"""
-    try:
-        decoded_prefix = unquote(prefix).replace('%2F', '/')
-        decoded_path = unquote(path).replace('%2F', '/')
-        
-        # Try to find service URL directly (this will handle hyphenated names)
-        service_url = ROUTE_SERVICES.get(decoded_prefix)
-        
-        # If no direct match, then try the api/v1 special case
-        if not service_url and decoded_prefix == "api" and decoded_path.startswith("v1/"):
-            service_url = ROUTE_SERVICES.get("api/v1")
-            forward_path = decoded_path[3:]  # Remove "v1/"
-        else:
-            forward_path = decoded_path
+    """Serve an idempotent GET from the response cache, revalidating stale entries upstream"""
+    entry = await response_cache.lookup(request, service_name, path, current_user)
+    if entry is not None and entry.is_fresh() and not response_cache.must_revalidate(request):
+        RESPONSE_CACHE_REQUESTS.labels(service=service_name, result="hit").inc()
+        return response_cache.serve(entry, request, "hit")
 
-        if not service_url:
-            available_services = list(ROUTE_SERVICES.keys())
-            raise HTTPException(
-                status_code=404,
-                detail=f"Service not found. Available services: {available_services}"
-            )
+    revalidation_headers = response_cache.revalidation_headers(entry)
+    response = await forward_request(
+        request=request,
+        service_url=service_url,
+        path=path,
+        current_user=current_user,
+        method="GET",
+        service_name=service_name,
+        extra_headers=revalidation_headers
+    )
+    if revalidation_headers and response.status_code == 304:
+        RESPONSE_CACHE_REQUESTS.labels(service=service_name, result="revalidated").inc()
+        entry = await response_cache.refresh(entry, response)
+        return response_cache.serve(entry, request, "revalidated")
 
-        return await forward_request(
-            request=request,
-            service_url=service_url,
-            path=forward_path,
-            current_user=current_user,
-            method="POST"  # Explicitly set method
-        )
+    RESPONSE_CACHE_REQUESTS.labels(service=service_name, result="miss").inc()
+    await response_cache.store(request, service_name, path, current_user, response)
+    response.headers["x-cache"] = "MISS"
+    return response
 
-    except Exception as e:
-        if isinstance(e, HTTPException):
-            raise e
-        raise HTTPException(status_code=500, detail=f"Gateway POST error: {str(e)}")
+# Request headers that change what the upstream (or the response cache) answers
+COALESCE_VARY_HEADERS = ('accept', 'accept-language', 'cache-control', 'if-none-match', 'range')
 
-@app.put("/{prefix}/{path:path}")
-async def gateway_router_put(
-    prefix: str,
-    path: str,
+async def forward_coalesced_request(
     request: Request,
-    current_user: Dict = Depends(get_current_user)
+    service_name: str,
+    service_url: str,
+    path: str,
+    current_user: Optional[Dict] = None
 ):
-    """Gateway router for PUT requests"""
-    try:
-        decoded_prefix = unquote(prefix).replace('%2F', '/')
-        decoded_path = unquote(path).replace('%2F', '/')
-        
-        # Try to find service URL
-        service_url = ROUTE_SERVICES.get(decoded_prefix)
-
-        # If no direct match, then try the api/v1 special case
-        if not service_url and decoded_prefix == "api" and decoded_path.startswith("v1/"):
-            service_url = ROUTE_SERVICES.get("api/v1")
-            forward_path = decoded_path[3:]  # Remove "v1/"
-        else:
-            forward_path = decoded_path
-            
-        if decoded_prefix == "api" and decoded_path.startswith("v1/"):
-            forward_path = decoded_path[3:]  # Remove "v1/"
-
+    """Share one upstream call between identical concurrent GETs from the same user"""
+    async def fetch():
+        if response_cache.applies_to(request, service_name):
+            return await forward_cached_request(
+                request=request,
+                service_name=service_name,
+                service_url=service_url,
+                path=path,
+                current_user=current_user
+            )
         return await forward_request(
             request=request,
             service_url=service_url,
-            path=forward_path,
+            path=path,
             current_user=current_user,
-            method="PUT"  # Explicitly set method
+            method="GET",
+            service_name=service_name
         )
 
-    except Exception as e:
-        if isinstance(e, HTTPException):
-            raise e
-        raise HTTPException(status_code=500, detail=f"Gateway PUT error: {str(e)}")
-
-@app.delete("/{prefix}/{path:path}")
-async def gateway_router_delete(
-    prefix: str,
-    path: str,
-    request: Request,
-    current_user: Dict = Depends(get_current_user)
-):
-    """Gateway router for DELETE requests"""
-    try:
-        decoded_prefix = unquote(prefix).replace('%2F', '/')
-        decoded_path = unquote(path).replace('%2F', '/')
-        
-        # Try to find service URL directly (this will handle hyphenated names)
-        service_url = ROUTE_SERVICES.get(decoded_prefix)
-        
-        # If no direct match, then try the api/v1 special case
-        if not service_url and decoded_prefix == "api" and decoded_path.startswith("v1/"):
-            service_url = ROUTE_SERVICES.get("api/v1")
-            forward_path = decoded_path[3:]  # Remove "v1/"
-        else:
-            forward_path = decoded_path
+    # Upstreams may answer per user without marking the response private, so
+    # only a user's own identical requests share a call; reuse across users is
+    # left to the response cache and its Cache-Control rules
+    key = request_context_key(request, service_name, path, current_user, private=True, vary=COALESCE_VARY_HEADERS)
+    response, shared = await request_coalescer.do(key, fetch)
+    if not shared:
+        COALESCED_REQUESTS.labels(service=service_name, role="leader").inc()
+        return response
 
-        if not service_url:
-            available_services = list(ROUTE_SERVICES.keys())
-            raise HTTPException(
-                status_code=404,
-                detail=f"Service not found. Available services: {available_services}"
-            )
+    COALESCED_REQUESTS.labels(service=service_name, role="follower").inc()
+    return Response(
+        content=response.body,
+        status_code=response.status_code,
+        headers={k: v for k, v in response.headers.items() if k != 'content-length'}
+    )
 
-        return await forward_request(
-            request=request,
-            service_url=service_url,
-            path=forward_path,
-            current_user=current_user,
-            method="DELETE"  # Explicitly set method
+async def get_service_url(prefix: str) -> str:
+    """Get service URL and validate prefix"""
+    service_url = ROUTE_SERVICES.get(prefix)
+    if not service_url:
+        available_services = list(ROUTE_SERVICES.keys())
+        logger.error(f"Service not found for prefix '{prefix}'. Available: {available_services}")
+        raise HTTPException(
+            status_code=404,
+            detail=f"Service '{prefix}' not found. Available services: {available_services}"
         )
+    return service_url
 
-    except Exception as e:
-        if isinstance(e, HTTPException):
-            raise e
-        raise HTTPException(status_code=500, detail=f"Gateway POST error: {str(e)}")
-
-@app.patch("/{prefix}/{path:path}")
-async def gateway_router_patch(
+@app.api_route(
+    "/{prefix}/{path:path}",
+    methods=["GET", "POST", "PUT", "DELETE", "PATCH"],
+    summary="Gateway router",
+    description="Routes requests to appropriate microservices"
+)
+async def gateway_router(
     prefix: str,
     path: str,
     request: Request,
-    current_user: Dict = Depends(get_current_user)
+    current_user: Dict = Depends(get_current_principal)
 ):
-    """Gateway router for PATCH requests"""
+    """Gateway router resolving every method through the compiled route table"""
+    request_method = request.method
     try:
-        decoded_prefix = unquote(prefix).replace('%2F', '/')
-        decoded_path = unquote(path).replace('%2F', '/')
-        
-        # Try to find service URL
-        service_url = None
-        if decoded_prefix == "api" and decoded_path.startswith("v1/"):
-            service_url = ROUTE_SERVICES.get("api/v1")
-        
-        if not service_url:
-            available_services = list(ROUTE_SERVICES.keys())
+        match = route_table.resolve(f"{prefix}/{path}")
+        if not match:
             raise HTTPException(
                 status_code=404,
-                detail=f"Service not found. Available services: {available_services}"
+                detail=f"Service '{RouteTable.decode(prefix)}' not found. Available services: {route_table.services}"
             )
 
-        # Adjust forward path
-        forward_path = decoded_path
-        if decoded_prefix == "api" and decoded_path.startswith("v1/"):
-            forward_path = decoded_path[3:]  # Remove "v1/"
+        forward_path = match.forward_path
+        if request_method == "GET":
+            # Clean and normalize the path
+            forward_path = forward_path.rstrip('/') or '/'
+            if settings.GATEWAY_COALESCE_GETS and not settings.GATEWAY_STREAMING:
+                return await forward_coalesced_request(
+                    request=request,
+                    service_name=match.service_name,
+                    service_url=match.service_url,
+                    path=forward_path,
+                    current_user=current_user
+                )
+            # Streamed responses have no buffered body to store, so the cache is bypassed
+            if not settings.GATEWAY_STREAMING and response_cache.applies_to(request, match.service_name):
+                return await forward_cached_request(
+                    request=request,
+                    service_name=match.service_name,
+                    service_url=match.service_url,
+                    path=forward_path,
+                    current_user=current_user
+                )
 
         return await forward_request(
             request=request,
-            service_url=service_url,
+            service_url=match.service_url,
             path=forward_path,
             current_user=current_user,
-            method="PATCH"  # Explicitly set method
+            method=request_method,
+            service_name=match.service_name
         )
 
     except Exception as e:
+        logger.exception(f"Error in {request_method} router: {str(e)}")
         if isinstance(e, HTTPException):
             raise e
-        raise HTTPException(status_code=500, detail=f"Gateway PATCH error: {str(e)}")
-
-# Add health check endpoint directly to gateway
-@app.get("/health")
-async def gateway_health():
-    """Gateway health check endpoint"""
-    return {
-        "status": "healthy",
-        "service": "gateway",
-        "timestamp": datetime.utcnow().isoformat()
-    }
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Gateway {request_method} error: {str(e)}")
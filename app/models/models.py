@@ -1,5 +1,5 @@
 #models.py
-from sqlalchemy import Column, Integer, String, Boolean, Float, Date, ForeignKey, DateTime, Text, JSON, LargeBinary, UniqueConstraint,Table
+from sqlalchemy import Column, Integer, String, Boolean, Float, Date, ForeignKey, DateTime, Text, JSON, LargeBinary, UniqueConstraint,Table, Index
 
 from app.utils.database import Base
 from sqlalchemy.orm import relationship
@@ -126,13 +126,18 @@ class InteractionHistory(Base):
     question = Column(Text)
     answer = Column(Text)
     documents = Column(Text)
-    original_document = Column(LargeBinary)  # New column to store the original document
+    original_document = Column(LargeBinary)  # New column to store the original document; STORAGE EXTERNAL, see deployment/migrations/002
     document_filename = Column(String)  # New column to store the original filename
     document_type = Column(String)  # New column to store the document type (e.g., 'pdf', 'csv')
     timestamp = Column(DateTime, default=datetime.utcnow)
 
     user = relationship("User", back_populates="interactions")
 
+    # Chat history: WHERE user_id AND session_id ORDER BY timestamp, id
+    __table_args__ = (
+        Index('ix_interaction_history_user_session_timestamp', 'user_id', 'session_id', 'timestamp', 'id'),
+    )
+
 class SuggestedQuestion(Base):
     __tablename__ = "suggested_questions"
 
@@ -173,6 +178,8 @@ class Article(Base):
     organization_id = Column(Integer, ForeignKey("organizations.id"), nullable=False)
     likes = relationship("LikedPost", back_populates="article")
 
+    __table_args__ = (Index('ix_articles_organization_id', 'organization_id'),)
+
     def __repr__(self):
         return f"<Article(id={self.id}, date={self.date}, title={self.title})>"
 
@@ -187,7 +194,14 @@ class LikedPost(Base):
     user = relationship("User", back_populates="liked_posts")
     article = relationship("Article", back_populates="likes")
 
-    __table_args__ = (UniqueConstraint('user_id', 'article_id', name='uq_user_article_like'),)
+    __table_args__ = (
+        UniqueConstraint('user_id', 'article_id', name='uq_user_article_like'),
+        # Liked posts: WHERE user_id ORDER BY liked_at DESC, id DESC, joined on article_id
+        Index(
+            'ix_liked_posts_user_liked_at', 'user_id', 'liked_at', 'id',
+            postgresql_include=['article_id']
+        ),
+    )
 
 class MetricDefinition(Base):
     __tablename__ = "metric_definitions"
@@ -43,6 +43,32 @@ class UserCreate(BaseModel):
     data_access: Optional[str] = None
     organization_name: str
 
+class BulkUserCreate(BaseModel):
+    username: str
+    email: EmailStr
+    password: str
+    role: str
+    data_access: Optional[str] = None
+    org_role: str = "member"  # role in the target organization: 'admin' or 'member'
+
+class BulkUserProvisionRequest(BaseModel):
+    users: List[BulkUserCreate]
+
+class BulkUserResult(BaseModel):
+    index: int
+    email: str
+    status: str  # created, added, already_member or error
+    user_id: Optional[int] = None
+    detail: Optional[str] = None
+
+class BulkUserProvisionResponse(BaseModel):
+    organization_id: int
+    created: int
+    added: int
+    already_member: int
+    failed: int
+    results: List[BulkUserResult]
+
 class UserRole(BaseModel):
     organization_id: int
     role: str
@@ -74,6 +100,13 @@ class User(BaseModel):
 class Token(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None
+
+class TokenRefreshRequest(BaseModel):
+    refresh_token: str
+
+class LogoutRequest(BaseModel):
+    refresh_token: Optional[str] = None
 
 class ChatRequest(BaseModel):
     message: str
@@ -87,7 +120,7 @@ class ChatResponse(BaseModel):
 class ChatHistoryResponse(BaseModel):
     question: str
     answer: str
-    timestamp: datetime
+    timestamp: Optional[datetime] = None
     documents: Optional[Dict[str, Any]] = None
 
     class Config:
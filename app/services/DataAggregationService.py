@@ -1,3 +1,4 @@
+import asyncio
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
@@ -5,15 +6,16 @@ from fastapi import HTTPException
 import logging
 import pandas as pd
 from app.models.models import DataSourceConnection, Organization, MetricDefinition
-from app.connectors.connector_factory import ConnectorFactory
+from app.connectors.async_connector import AsyncBaseConnector, async_connectors
+from app.utils.shared_cache import create_cache_backend
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class DynamicDataAggregationService:
     def __init__(self):
-        self.cached_data = {}
-        self.cache_timestamp = None
+        # Shared across worker processes when REDIS_URL is configured
+        self.cache = create_cache_backend("aggregated-data")
         self.cache_duration = timedelta(minutes=15)
 
     async def get_aggregated_data(
@@ -26,8 +28,9 @@ class DynamicDataAggregationService:
         Fetch and aggregate data from all data sources using dynamically discovered metrics.
         """
         cache_key = f"{org_id}_{time_range}"
-        if self._is_cache_valid(cache_key):
-            return self.cached_data[cache_key]
+        cached = await self.cache.get_value(cache_key)
+        if cached is not None:
+            return cached
 
         try:
             # Get all data source connections for the organization
@@ -56,8 +59,11 @@ class DynamicDataAggregationService:
             self._add_global_insights(aggregated_data)
             
             # Cache the results
-            self.cached_data[cache_key] = aggregated_data
-            self.cache_timestamp = datetime.utcnow()
+            await self.cache.set_value(
+                cache_key,
+                aggregated_data,
+                ttl=self.cache_duration.total_seconds()
+            )
 
             return aggregated_data
 
@@ -85,13 +91,6 @@ class DynamicDataAggregationService:
                 logger.warning(f"No metrics defined for connection {connection.name}")
                 return {}
 
-            connector = ConnectorFactory.get_connector(
-                connection.source_type,
-                **connection.connection_params
-            )
-            
-            connector.connect()
-            
             source_data = {
                 "metrics": {},
                 "trends": {},
@@ -105,6 +104,7 @@ class DynamicDataAggregationService:
             # Build date ranges
             date_ranges = self._get_date_ranges(time_range)
             
+            connector = async_connectors.get(connection)
             for metric in metrics:
                 try:
                     metric_data = await self._calculate_metric(
@@ -134,7 +134,6 @@ class DynamicDataAggregationService:
                     logger.error(f"Error calculating metric {metric.name}: {str(e)}")
                     continue
 
-            connector.disconnect()
             return source_data
 
         except Exception as e:
@@ -143,7 +142,7 @@ class DynamicDataAggregationService:
 
     async def _calculate_metric(
         self,
-        connector: Any,
+        connector: AsyncBaseConnector,
         table_name: str,
         metric: MetricDefinition,
         date_column: str,
@@ -175,9 +174,11 @@ class DynamicDataAggregationService:
                 FROM metric_calculation
             """
 
-            # Execute queries
-            current_result = connector.query(current_query)
-            previous_result = connector.query(previous_query)
+            # Execute queries; both periods run concurrently off the event loop
+            current_result, previous_result = await asyncio.gather(
+                connector.aquery(current_query),
+                connector.aquery(previous_query)
+            )
 
             # Get trend data if needed
             trend_data = []
@@ -192,7 +193,7 @@ class DynamicDataAggregationService:
                     GROUP BY {date_column}
                     ORDER BY {date_column}
                 """
-                trend_data = connector.query(trend_query)
+                trend_data = await connector.aquery(trend_query)
 
             # Process results
             current_value = float(current_result[0]['current_value']) if current_result else 0
@@ -322,14 +323,4 @@ class DynamicDataAggregationService:
                 "start": previous_start.strftime("%Y-%m-%d"),
                 "end": previous_end.strftime("%Y-%m-%d")
             }
-        }
-
-    def _is_cache_valid(self, cache_key: str) -> bool:
-        """Check if cached data is still valid."""
-        if (
-            cache_key in self.cached_data
-            and self.cache_timestamp
-            and datetime.utcnow() - self.cache_timestamp < self.cache_duration
-        ):
-            return True
-        return False
\ No newline at end of file
+        }
\ No newline at end of file
@@ -1,8 +1,10 @@
 from typing import Optional, List, Dict, Any, Tuple
+import asyncio
 import logging
 from datetime import datetime
 from openai import OpenAI
 import json
+from app.connectors.async_connector import AsyncBaseConnector
 
 logger = logging.getLogger(__name__)
 
@@ -56,6 +58,15 @@ class DateColumnDetection:
             logger.error(f"Error detecting date column: {str(e)}")
             return None
 
+    async def _run_query(self, connector: Any, query: str, params=None) -> List[Dict]:
+        """Run a query off the event loop for either an async or a blocking connector."""
+        if isinstance(connector, AsyncBaseConnector):
+            return await connector.aquery(query, params)
+        # Salesforce and Google Sheets connectors take no params argument
+        if params is None:
+            return await asyncio.to_thread(connector.query, query)
+        return await asyncio.to_thread(connector.query, query, params)
+
     async def _fetch_schema(self, connector: Any, table_name: str) -> Tuple[List[Dict], Dict]:
         """Fetch schema information based on connector type."""
         try:
@@ -96,7 +107,7 @@ class DateColumnDetection:
                 params = (table_name,)
 
             # Execute query with appropriate parameters
-            schema_data = connector.query(schema_query, params)
+            schema_data = await self._run_query(connector, schema_query, params)
             if not schema_data:
                 raise ValueError(f"No schema information found for table {table_name}")
 
@@ -141,7 +152,7 @@ class DateColumnDetection:
                 query = f"SELECT * FROM {table_name} LIMIT 5"
                 params = None
 
-            sample_data = connector.query(query, params)
+            sample_data = await self._run_query(connector, query, params)
 
             # Standardize case based on database type
             if connector.source_type == 'snowflake':
@@ -251,7 +262,7 @@ Return ONLY the column name."""
                     FROM {table_name}
                 """
             
-            result = connector.query(validation_query)
+            result = await self._run_query(connector, validation_query)
             if not result:
                 return False
             
@@ -6,6 +6,9 @@ from sqlalchemy import text
 import pandas as pd
 import logging
 from app.models.models import DataSourceConnection, MetricDefinition
+from app.utils.shared_cache import create_cache_backend
+from app.connectors.connection_pool import connector_pools
+from app.connectors.async_connector import AsyncBaseConnector, async_connectors
 import numpy as np
 import math
 from prophet import Prophet
@@ -17,9 +20,9 @@ logger = logging.getLogger(__name__)
 
 class DynamicAnalysisService:
     def __init__(self):
-        self.cached_schemas = {}
+        # Shared across worker processes when REDIS_URL is configured
+        self.schema_cache = create_cache_backend("table-schemas")
         self.cache_duration = timedelta(minutes=15)
-        self.cache_timestamp = None
 
     async def analyze_data(
         self,
@@ -78,8 +81,9 @@ class DynamicAnalysisService:
         """Dynamically fetch and cache table schema."""
         cache_key = f"{connection.id}_{connection.table_name}"
         
-        if self._is_cache_valid(cache_key):
-            return self.cached_schemas[cache_key]
+        cached = await self.schema_cache.get_value(cache_key)
+        if cached is not None:
+            return cached
 
         try:
             if connection.source_type == 'postgresql':
@@ -106,8 +110,7 @@ class DynamicAnalysisService:
             else:
                 raise ValueError(f"Unsupported source type: {connection.source_type}")
 
-            connector = self._get_connector(connection)
-            schema_data = connector.query(schema_query, params)
+            schema_data = await self._async_connector(connection).aquery(schema_query, params)
 
             # Process and cache schema
             schema = {
@@ -118,8 +121,11 @@ class DynamicAnalysisService:
                 for row in schema_data
             }
 
-            self.cached_schemas[cache_key] = schema
-            self.cache_timestamp = datetime.utcnow()
+            await self.schema_cache.set_value(
+                cache_key,
+                schema,
+                ttl=self.cache_duration.total_seconds()
+            )
 
             return schema
 
@@ -222,25 +228,18 @@ class DynamicAnalysisService:
         self,
         connection: DataSourceConnection,
         query: str
-    ) -> List[Dict[str, Any]]:
+    ) -> pd.DataFrame:
         """Execute query using appropriate connector."""
-        try:
-            connector = self._get_connector(connection)
-            results = connector.query(query)
-            return results
-        finally:
-            if connector:
-                connector.disconnect()
+        return await self._async_connector(connection).aquery_frame(query)
 
     def _format_results(
         self,
-        results: List[Dict[str, Any]],
+        df: pd.DataFrame,
         metrics: List[MetricDefinition],
         question: str
     ) -> Dict[str, Any]:
         """Format results based on question context and metrics."""
         try:
-            df = pd.DataFrame(results)
             formatted_data = {
                 "metrics": {},
                 "trends": {},
@@ -322,21 +321,13 @@ class DynamicAnalysisService:
                 
         return dimensions
 
-    def _is_cache_valid(self, cache_key: str) -> bool:
-        """Check if cached schema is still valid."""
-        return (
-            cache_key in self.cached_schemas
-            and self.cache_timestamp
-            and datetime.utcnow() - self.cache_timestamp < self.cache_duration
-        )
-
-    def _get_connector(self, connection: DataSourceConnection):
-        """Get appropriate database connector."""
-        from connectors.connector_factory import ConnectorFactory
-        return ConnectorFactory.get_connector(
-            connection.source_type,
-            **connection.connection_params
-        )
+    def _connector(self, connection: DataSourceConnection):
+        """Borrow a pooled connector for the connection (a context manager)."""
+        return connector_pools.connection(connection)
+
+    def _async_connector(self, connection: DataSourceConnection) -> AsyncBaseConnector:
+        """Connector whose queries run off the event loop, for the async paths."""
+        return async_connectors.get(connection)
     
     async def analyze_metrics(
         self,
@@ -377,7 +368,7 @@ class DynamicAnalysisService:
                         resolution=resolution
                     )
                     
-                    if results:
+                    if not results.empty:
                         source_metrics = self._process_source_metrics(
                             results=results,
                             metrics=metrics,
@@ -493,7 +484,7 @@ class DynamicAnalysisService:
         metrics: List[MetricDefinition],
         scope: str,
         resolution: str
-    ) -> List[Dict[str, Any]]:
+    ) -> pd.DataFrame:
         """Fetch metric data from a data source."""
         try:
             # Get date range
@@ -527,8 +518,7 @@ class DynamicAnalysisService:
             """
 
             # Execute query
-            connector = self._get_connector(connection)
-            results = connector.query(query)
+            results = await self._async_connector(connection).aquery_frame(query)
             
             return results
 
@@ -583,14 +573,14 @@ class DynamicAnalysisService:
 
     def _process_source_metrics(
         self,
-        results: List[Dict[str, Any]],
+        results: pd.DataFrame,
         metrics: List[MetricDefinition],
         source_name: str
     ) -> Dict[str, Any]:
         """Process raw metrics results into structured format."""
         try:
             processed_metrics = {}
-            df = pd.DataFrame(results)
+            df = results
 
             for metric in metrics:
                 try:
@@ -769,10 +759,10 @@ class DynamicAnalysisService:
                 lookback_days=365
             )
 
-            if not historical_data:
+            if historical_data.empty:
                 raise ValueError("No historical data available for forecasting")
 
-            df = pd.DataFrame(historical_data, columns=['period', 'value'])
+            df = historical_data[['period', 'value']].copy()
             df['value'] = pd.to_numeric(df['value'], errors='coerce')
             df = df.dropna()
             df = df.sort_values('period').reset_index(drop=True)
@@ -2011,7 +2001,7 @@ class DynamicAnalysisService:
         org_id: int,
         metric: MetricDefinition,
         lookback_days: int = 365
-    ) -> List[Dict[str, Any]]:
+    ) -> pd.DataFrame:
         """Get historical data for a specific metric."""
         try:
             # Get connection details
@@ -2046,29 +2036,15 @@ class DynamicAnalysisService:
             ORDER BY period ASC
             """
 
-            # Execute query
-            connector = self._get_connector(connection)
-            try:
-                results = connector.query(query)
-                logger.info(f"Query returned {len(results)} rows")
-                if results:
-                    sample = results[0]
-                    logger.info(f"Sample result: {sample}")
-
-                processed_results = []
-                for row in results:
-                    # Convert dictionary keys to lowercase
-                    processed_row = {
-                        'period': row.get('PERIOD', row.get('period')),
-                        'value': row.get('VALUE', row.get('value'))
-                    }
-                    processed_results.append(processed_row)
-
-                return processed_results
+            # Execute query straight into columns
+            with self._connector(connection) as connector:
+                history = connector.query_frame(query)
+            logger.info(f"Query returned {len(history)} rows")
 
-            finally:
-                connector.disconnect()
+            # Snowflake reports upper-case column names
+            history.columns = [str(column).lower() for column in history.columns]
+            return history
 
         except Exception as e:
             logger.error(f"Error getting metric history for {metric.name}: {str(e)}")
-            return []
\ No newline at end of file
+            return pd.DataFrame(columns=['period', 'value'])
\ No newline at end of file
@@ -0,0 +1,264 @@
+# app/services/email_dispatcher.py
+import asyncio
+import logging
+import smtplib
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime
+from email.message import Message
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from app.utils.metrics import EMAIL_DELIVERIES, EMAIL_QUEUE_DEPTH
+
+logger = logging.getLogger(__name__)
+
+class EmailSink(ABC):
+    """Delivers messages; called from a worker thread, one batch at a time."""
+
+    @abstractmethod
+    def send_batch(self, messages: List[Message]) -> List[Optional[Exception]]:
+        """Send every message and return one error (or None) per message."""
+
+    def close(self):
+        pass
+
+class SMTPSink(EmailSink):
+    """
+    Keeps one authenticated SMTP session open across batches. STARTTLS on
+    `port` is tried first, falling back to implicit SSL on `ssl_port`.
+    """
+
+    def __init__(self, host: str, port: int, username: str, password: str, ssl_port: int = 465, timeout: float = 30.0):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.ssl_port = ssl_port
+        self.timeout = timeout
+        self._server: Optional[smtplib.SMTP] = None
+
+    def _connect(self) -> smtplib.SMTP:
+        try:
+            server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            server.starttls()
+        except (smtplib.SMTPException, OSError) as e:
+            logger.warning(f"STARTTLS connection to {self.host}:{self.port} failed ({str(e)}), trying SSL")
+            server = smtplib.SMTP_SSL(self.host, self.ssl_port, timeout=self.timeout)
+        server.login(self.username, self.password)
+        return server
+
+    def _connection(self) -> smtplib.SMTP:
+        if self._server is not None:
+            try:
+                if self._server.noop()[0] == 250:
+                    return self._server
+            except (smtplib.SMTPException, OSError):
+                pass
+            self.close()
+        self._server = self._connect()
+        return self._server
+
+    def send_batch(self, messages: List[Message]) -> List[Optional[Exception]]:
+        try:
+            server = self._connection()
+        except (smtplib.SMTPException, OSError) as e:
+            return [e] * len(messages)
+
+        errors = []
+        for message in messages:
+            try:
+                try:
+                    server.send_message(message)
+                except smtplib.SMTPServerDisconnected:
+                    # The server dropped the session mid-batch; reconnect once
+                    self.close()
+                    server = self._connection()
+                    server.send_message(message)
+                errors.append(None)
+            except (smtplib.SMTPException, OSError) as e:
+                errors.append(e)
+        return errors
+
+    def close(self):
+        if self._server is not None:
+            try:
+                self._server.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._server = None
+
+class FileSink(EmailSink):
+    """Writes each message to `directory` as an .eml file instead of sending it."""
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def send_batch(self, messages: List[Message]) -> List[Optional[Exception]]:
+        errors = []
+        for message in messages:
+            try:
+                name = f"{datetime.utcnow():%Y%m%dT%H%M%S%f}-{uuid.uuid4().hex[:8]}.eml"
+                (self.directory / name).write_bytes(message.as_bytes())
+                errors.append(None)
+            except OSError as e:
+                errors.append(e)
+        return errors
+
+class InMemorySink(EmailSink):
+    """Collects messages in `messages`; for local runs and tests."""
+
+    def __init__(self):
+        self.messages: List[Message] = []
+
+    def send_batch(self, messages: List[Message]) -> List[Optional[Exception]]:
+        self.messages.extend(messages)
+        return [None] * len(messages)
+
+@dataclass
+class OutboundEmail:
+    message: Message
+    attempts: int = 0
+
+class EmailDispatcher:
+    """
+    Background email delivery: request handlers enqueue messages and return
+    immediately; worker tasks drain the queue in batches over their own sink
+    (and SMTP session), retrying failed messages with exponential backoff.
+    """
+
+    def __init__(
+        self,
+        sink_factory: Callable[[], EmailSink],
+        workers: int = 1,
+        queue_size: int = 1000,
+        batch_size: int = 20,
+        max_retries: int = 3,
+        retry_backoff: float = 2.0,
+        idle_seconds: float = 60.0
+    ):
+        self.sink_factory = sink_factory
+        self.workers = workers
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.idle_seconds = idle_seconds
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._sinks: List[EmailSink] = []
+        # Failed messages waiting out their backoff, keyed by id(item)
+        self._retries: Dict[int, asyncio.TimerHandle] = {}
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def start(self):
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        for worker_id in range(self.workers):
+            sink = self.sink_factory()
+            self._sinks.append(sink)
+            self._tasks.append(asyncio.create_task(self._run(worker_id, sink)))
+        logger.info(f"Email dispatcher started with {self.workers} worker(s)")
+
+    async def stop(self, timeout: float = 10.0):
+        """Deliver what is queued (up to `timeout` seconds), then stop the workers."""
+        if not self.running:
+            return
+        try:
+            await asyncio.wait_for(self._drain(), timeout=timeout)
+        except asyncio.TimeoutError:
+            undelivered = self._queue.qsize() + len(self._retries)
+            logger.warning(f"Email dispatcher stopped with {undelivered} message(s) undelivered")
+        for handle in self._retries.values():
+            handle.cancel()
+        self._retries.clear()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        for sink in self._sinks:
+            await asyncio.to_thread(sink.close)
+        self._tasks.clear()
+        self._sinks.clear()
+
+    async def _drain(self):
+        """Wait until the queue is empty and no retry is still backing off."""
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._queue.join()
+            if not self._retries:
+                return
+            next_retry = min(handle.when() for handle in self._retries.values())
+            await asyncio.sleep(max(0.0, next_retry - loop.time()))
+
+    def enqueue(self, message: Message) -> bool:
+        """Queue a message for delivery; False if the dispatcher is stopped or full."""
+        if not self.running:
+            logger.error(f"Email dispatcher is not running; dropping message to {message['To']}")
+            return False
+        return self._put(OutboundEmail(message))
+
+    def _put(self, item: OutboundEmail) -> bool:
+        try:
+            self._queue.put_nowait(item)
+        except asyncio.QueueFull:
+            logger.error(f"Email queue is full; dropping message to {item.message['To']}")
+            EMAIL_DELIVERIES.labels(result="dropped").inc()
+            return False
+        EMAIL_QUEUE_DEPTH.inc()
+        return True
+
+    async def _next_batch(self, sink: EmailSink) -> List[OutboundEmail]:
+        try:
+            first = await asyncio.wait_for(self._queue.get(), timeout=self.idle_seconds)
+        except asyncio.TimeoutError:
+            # Servers drop idle sessions anyway; release ours while quiet
+            await asyncio.to_thread(sink.close)
+            return []
+        batch = [first]
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        EMAIL_QUEUE_DEPTH.dec(len(batch))
+        return batch
+
+    async def _run(self, worker_id: int, sink: EmailSink):
+        while True:
+            batch = await self._next_batch(sink)
+            if not batch:
+                continue
+            try:
+                errors = await asyncio.to_thread(sink.send_batch, [item.message for item in batch])
+            except Exception as e:
+                logger.exception(f"Email worker {worker_id} failed to send a batch: {str(e)}")
+                errors = [e] * len(batch)
+            for item, error in zip(batch, errors):
+                if error is None:
+                    EMAIL_DELIVERIES.labels(result="sent").inc()
+                    logger.info(f"Email sent successfully to {item.message['To']}")
+                else:
+                    self._retry(item, error)
+                # A retry is tracked in _retries before the item counts as done
+                self._queue.task_done()
+
+    def _retry(self, item: OutboundEmail, error: Exception):
+        item.attempts += 1
+        if item.attempts > self.max_retries:
+            EMAIL_DELIVERIES.labels(result="failed").inc()
+            logger.error(f"Giving up on email to {item.message['To']} after {item.attempts} attempts: {str(error)}")
+            return
+        delay = self.retry_backoff * 2 ** (item.attempts - 1)
+        EMAIL_DELIVERIES.labels(result="retried").inc()
+        logger.warning(f"Email to {item.message['To']} failed ({str(error)}); retrying in {delay:.0f}s")
+        self._retries[id(item)] = asyncio.get_running_loop().call_later(delay, self._requeue, item)
+
+    def _requeue(self, item: OutboundEmail):
+        self._retries.pop(id(item), None)
+        self._put(item)
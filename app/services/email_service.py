@@ -1,14 +1,16 @@
 # app/services/email_service.py
 import os
-import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from jinja2 import Template
 from datetime import datetime, timedelta
 import secrets
 from typing import Optional
 import logging
 
+from app.services.email_dispatcher import EmailDispatcher, EmailSink, FileSink, InMemorySink, SMTPSink
+from app.services.email_templates import create_email_templates
+from app.utils.config import settings
+
 logger = logging.getLogger(__name__)
 
 # Email configuration
@@ -20,114 +22,73 @@ SENDER_EMAIL = os.getenv("SENDER_EMAIL", "dummy@othor.ai")
 SENDER_NAME = os.getenv("SENDER_NAME", "Othor AI")
 FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:3000")
 
-def send_email(to_email: str, subject: str, html_content: str) -> bool:
-    """
-    Send an email using organization's SMTP server
-    """
-    try:
-        if not all([SMTP_SERVER, SMTP_USERNAME, SMTP_PASSWORD]):
-            logger.error("SMTP credentials not configured")
-            return False
+email_templates = create_email_templates(FRONTEND_URL)
 
-        # Create message
-        message = MIMEMultipart("alternative")
-        message["Subject"] = subject
-        message["From"] = f"{SENDER_NAME} <{SENDER_EMAIL}>"
-        message["To"] = to_email
+def build_message(to_email: str, subject: str, html_content: str) -> MIMEMultipart:
+    message = MIMEMultipart("alternative")
+    message["Subject"] = subject
+    message["From"] = f"{SENDER_NAME} <{SENDER_EMAIL}>"
+    message["To"] = to_email
+    message.attach(MIMEText(html_content, "html"))
+    return message
 
-        # Add HTML content
-        html_part = MIMEText(html_content, "html")
-        message.attach(html_part)
+def create_email_sink() -> EmailSink:
+    """Sink selected by EMAIL_SINK; each dispatcher worker gets its own"""
+    if settings.EMAIL_SINK == "file":
+        return FileSink(settings.EMAIL_FILE_SINK_DIR)
+    if settings.EMAIL_SINK == "memory":
+        return InMemorySink()
+    return SMTPSink(SMTP_SERVER, SMTP_PORT, SMTP_USERNAME, SMTP_PASSWORD)
 
-        # Connect to SMTP server
-        # Note: Some servers might use SSL instead of TLS
-        try:
-            # Try TLS connection first
-            with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
-                server.starttls()
-                server.login(SMTP_USERNAME, SMTP_PASSWORD)
-                server.send_message(message)
-        except:
-            # If TLS fails, try SSL
-            with smtplib.SMTP_SSL(SMTP_SERVER, 465) as server:
-                server.login(SMTP_USERNAME, SMTP_PASSWORD)
-                server.send_message(message)
+email_dispatcher = EmailDispatcher(
+    create_email_sink,
+    workers=settings.EMAIL_WORKERS,
+    queue_size=settings.EMAIL_QUEUE_SIZE,
+    batch_size=settings.EMAIL_BATCH_SIZE,
+    max_retries=settings.EMAIL_MAX_RETRIES,
+    retry_backoff=settings.EMAIL_RETRY_BACKOFF_SECONDS,
+    idle_seconds=settings.EMAIL_SMTP_IDLE_SECONDS
+)
 
-        logger.info(f"Email sent successfully to {to_email}")
-        return True
+def send_email(to_email: str, subject: str, html_content: str) -> bool:
+    """
+    Send an email synchronously over a one-off connection. Request handlers
+    should use queue_email instead.
+    """
+    if not all([SMTP_SERVER, SMTP_USERNAME, SMTP_PASSWORD]):
+        logger.error("SMTP credentials not configured")
+        return False
 
-    except Exception as e:
-        logger.error(f"Failed to send email: {str(e)}")
+    sink = create_email_sink()
+    try:
+        error = sink.send_batch([build_message(to_email, subject, html_content)])[0]
+    finally:
+        sink.close()
+    if error is not None:
+        logger.error(f"Failed to send email: {str(error)}")
         return False
+    logger.info(f"Email sent successfully to {to_email}")
+    return True
+
+def queue_email(to_email: str, subject: str, html_content: str) -> bool:
+    """Hand an email to the background dispatcher; True once it is queued"""
+    return email_dispatcher.enqueue(build_message(to_email, subject, html_content))
 
 def generate_verification_token() -> str:
     """Generate a secure verification token"""
     return secrets.token_urlsafe(32)
 
 def send_verification_email(email: str, token: str, frontend_url: Optional[str] = None) -> bool:
-    """Send verification email with Othor AI branding"""
-    print(f"--------{frontend_url}-------------")
-    verification_link = f"{FRONTEND_URL}/verification?token={token}"
-    
-    template = Template("""
-    <!DOCTYPE html>
-    <html>
-        <head>
-            <style>
-                body { font-family: 'Arial', sans-serif; line-height: 1.6; color: #333; margin: 0; padding: 0; }
-                .container { max-width: 600px; margin: 0 auto; padding: 20px; }
-                .header { background-color: #1a1a1a; padding: 20px; text-align: center; }
-                .logo { width: 150px; height: auto; }
-                .content { padding: 30px 20px; background-color: #ffffff; }
-                .button {
-                    display: inline-block;
-                    padding: 12px 24px;
-                    background-color: #007bff;
-                    color: white !important;
-                    text-decoration: none;
-                    border-radius: 5px;
-                    margin: 20px 0;
-                    font-weight: bold;
-                }
-                .footer {
-                    margin-top: 30px;
-                    padding: 20px;
-                    background-color: #f8f9fa;
-                    font-size: 12px;
-                    color: #666;
-                    text-align: center;
-                }
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <img src="{{ logo_url }}" alt="Othor AI" class="logo">
-                </div>
-                <div class="content">
-                    <h2>Verify your email address</h2>
-                    <p>Thank you for signing up for Othor AI! Please click the button below to verify your email address:</p>
-                    <a href="{{ verification_link }}" class="button">Verify Email</a>
-                    <p>Or copy and paste this link into your browser:</p>
-                    <p>{{ verification_link }}</p>
-                    <p>This link will expire in 24 hours.</p>
-                </div>
-                <div class="footer">
-                    <p>If you didn't request this verification, please ignore this email.</p>
-                    <p>© {{ year }} Othor AI. All rights reserved.</p>
-                </div>
-            </div>
-        </body>
-    </html>
-    """)
+    """Send verification email with Othor AI branding; links to `frontend_url` (default FRONTEND_URL)"""
+    verification_link = f"{frontend_url or FRONTEND_URL}/verification?token={token}"
     
-    html_content = template.render(
+    html_content = email_templates.render(
+        "verification.html",
         verification_link=verification_link,
-        logo_url=f"{FRONTEND_URL}/images/othor-logo.png",
         year=datetime.utcnow().year
     )
     
-    return send_email(
+    return queue_email(
         to_email=email,
         subject="Verify your Othor AI account",
         html_content=html_content
@@ -135,64 +96,11 @@ def send_verification_email(email: str, token: str, frontend_url: Optional[str]
 
 def send_welcome_email(email: str) -> bool:
     """Send welcome email with Othor AI branding"""
-    template = Template("""
-    <!DOCTYPE html>
-    <html>
-        <head>
-            <style>
-                body { font-family: 'Arial', sans-serif; line-height: 1.6; color: #333; margin: 0; padding: 0; }
-                .container { max-width: 600px; margin: 0 auto; padding: 20px; }
-                .header { background-color: #1a1a1a; padding: 20px; text-align: center; }
-                .logo { width: 150px; height: auto; }
-                .content { padding: 30px 20px; background-color: #ffffff; }
-                .button {
-                    display: inline-block;
-                    padding: 12px 24px;
-                    background-color: #007bff;
-                    color: white !important;
-                    text-decoration: none;
-                    border-radius: 5px;
-                    margin: 20px 0;
-                    font-weight: bold;
-                }
-                .footer {
-                    margin-top: 30px;
-                    padding: 20px;
-                    background-color: #f8f9fa;
-                    font-size: 12px;
-                    color: #666;
-                    text-align: center;
-                }
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <img src="{{ logo_url }}" alt="Othor AI" class="logo">
-                </div>
-                <div class="content">
-                    <h2>Welcome to Othor AI!</h2>
-                    <p>Thank you for verifying your email address. Your account is now fully activated.</p>
-                    <p>You can now log in to your account and start exploring our platform:</p>
-                    <a href="{{ login_link }}" class="button">Log In to Othor AI</a>
-                    <p>If you have any questions or need assistance, our support team is here to help.</p>
-                </div>
-                <div class="footer">
-                    <p>© {{ year }} Othor AI. All rights reserved.</p>
-                </div>
-            </div>
-        </body>
-    </html>
-    """)
+    # Identical for every recipient, so it is only rendered once a year
+    html_content = email_templates.render_static("welcome.html", year=datetime.utcnow().year)
     
-    html_content = template.render(
-        login_link=f"{FRONTEND_URL}/login",
-        logo_url=f"{FRONTEND_URL}/images/othor-logo.png",
-        year=datetime.utcnow().year
-    )
-    
-    return send_email(
+    return queue_email(
         to_email=email,
         subject="Welcome to Othor AI!",
         html_content=html_content
-    )
\ No newline at end of file
+    )
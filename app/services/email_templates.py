@@ -0,0 +1,58 @@
+# app/services/email_templates.py
+import logging
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
+
+from app.utils.config import settings
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_DIR = Path(__file__).resolve().parent.parent / "templates" / "email"
+
+class EmailTemplateRegistry:
+    """
+    Email templates loaded and compiled once per process. With a bytecode
+    cache directory the compiled code is also shared across workers and
+    restarts. Templates that only depend on process-wide values (see
+    render_static) are rendered once and reused.
+    """
+
+    def __init__(self, directory: Path, bytecode_cache_dir: Optional[str] = None, **globals):
+        bytecode_cache = None
+        if bytecode_cache_dir:
+            os.makedirs(bytecode_cache_dir, exist_ok=True)
+            bytecode_cache = FileSystemBytecodeCache(bytecode_cache_dir)
+        self.env = Environment(
+            loader=FileSystemLoader(str(directory)),
+            autoescape=select_autoescape(["html"]),
+            bytecode_cache=bytecode_cache,
+            # Templates ship with the code; skip the per-render mtime check
+            auto_reload=False
+        )
+        self.env.globals.update(globals)
+        self.render_static = lru_cache(maxsize=64)(self._render_static)
+
+    def preload(self):
+        """Compile every template up front so the first email pays nothing."""
+        for name in self.env.list_templates(extensions=["html"]):
+            self.env.get_template(name)
+        logger.info(f"Compiled email templates: {', '.join(self.env.list_templates(extensions=['html']))}")
+
+    def render(self, name: str, **context) -> str:
+        return self.env.get_template(name).render(**context)
+
+    def _render_static(self, name: str, **context) -> str:
+        # Cached per (name, context); only for templates without per-recipient data
+        return self.render(name, **context)
+
+def create_email_templates(frontend_url: str) -> EmailTemplateRegistry:
+    return EmailTemplateRegistry(
+        TEMPLATE_DIR,
+        bytecode_cache_dir=settings.EMAIL_TEMPLATE_CACHE_DIR,
+        logo_url=f"{frontend_url}/images/othor-logo.png",
+        login_link=f"{frontend_url}/login"
+    )
@@ -1,16 +1,13 @@
 #app/services/metric_discovery.py
 import logging
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Tuple
 from openai import OpenAI
 import json
 from datetime import datetime, date
 from decimal import Decimal
 from sqlalchemy.orm import Session
 from app.models.models import MetricDefinition, DataSourceConnection
-from app.connectors.connector_factory import ConnectorFactory
-from app.connectors.mysql_connector import MySQLConnector
-from app.connectors.postgresql_connector import PostgreSQLConnector
-from app.connectors.snowflake_connector import SnowflakeConnector
+from app.connectors.async_connector import AsyncBaseConnector, async_connectors
 import re
 
 logging.basicConfig(level=logging.INFO)
@@ -74,20 +71,14 @@ class MetricDiscoveryService:
 
     async def discover_metrics(self, connection_id: int, db: Session) -> List[MetricDefinition]:
         """Discover metrics from any data source."""
-        connector = None
         try:
             # Get connection details and create connector
             connection = db.query(DataSourceConnection).filter_by(id=connection_id).first()
             if not connection:
                 raise ValueError(f"Connection {connection_id} not found")
 
-            connector = ConnectorFactory.get_connector(
-                connection.source_type,
-                **connection.connection_params
-            )
-            
             # Get sample data and generate prompt
-            connector.connect()
+            connector = async_connectors.get(connection)
             sample_data, table_schema = await self.fetch_sample_data(connector, connection.table_name)
             system_message, prompt = self.analyze_data_structure(sample_data, table_schema, connection.table_name)
             
@@ -117,7 +108,7 @@ class MetricDiscoveryService:
                     """
                     
                     logger.info(f"Testing query for {metric_data['name']}: {test_query}")
-                    connector.query(test_query)
+                    await connector.aquery(test_query)
                     logger.info(f"Query validation successful for {metric_data['name']}")
                     
                     # Create metric definition
@@ -150,18 +141,12 @@ class MetricDiscoveryService:
             logger.error(f"Error discovering metrics: {str(e)}")
             db.rollback()
             raise
-        finally:
-            if connector:
-                try:
-                    connector.disconnect()
-                except Exception as e:
-                    logger.error(f"Error disconnecting: {str(e)}")
 
-    async def fetch_sample_data(self, connector: Any, table_name: str) -> Tuple[List[Dict], Dict]:
+    async def fetch_sample_data(self, connector: AsyncBaseConnector, table_name: str) -> Tuple[List[Dict], Dict]:
         """Fetch sample data and schema information from the data source."""
         try:
             # Different schema queries for different databases
-            if isinstance(connector, MySQLConnector):
+            if connector.source_type == 'mysql':
                 schema_query = """
                     SELECT 
                         COLUMN_NAME as column_name, 
@@ -172,8 +157,8 @@ class MetricDiscoveryService:
                     AND TABLE_SCHEMA = DATABASE()
                 """
                 params = (table_name,)
-                schema_data = connector.query(schema_query, params)
-            elif isinstance(connector, PostgreSQLConnector):
+                schema_data = await connector.aquery(schema_query, params)
+            elif connector.source_type == 'postgresql':
                 schema_query = """
                     SELECT 
                         LOWER(column_name) as column_name,
@@ -184,9 +169,9 @@ class MetricDiscoveryService:
                     AND table_schema = current_schema()
                 """
                 params = (table_name,)
-                schema_data = connector.query(schema_query, params)
+                schema_data = await connector.aquery(schema_query, params)
 
-            elif isinstance(connector, SnowflakeConnector):
+            elif connector.source_type == 'snowflake':
                 # Snowflake specific query
                 schema_query = f"""
                     SELECT 
@@ -197,7 +182,7 @@ class MetricDiscoveryService:
                     WHERE TABLE_NAME = %s 
                     AND TABLE_SCHEMA = '{connector.schema}'
                 """
-                schema_data = connector.query(schema_query, (table_name,))
+                schema_data = await connector.aquery(schema_query, (table_name,))
 
                 if not schema_data:
                     raise ValueError(f"No schema information found for table {table_name}")
@@ -219,7 +204,7 @@ class MetricDiscoveryService:
 
                 # Get sample data with fully qualified path
                 sample_query = f"SELECT * FROM {connector.database}.{connector.schema}.{table_name} LIMIT 5"
-                sample_data = connector.query(sample_query)
+                sample_data = await connector.aquery(sample_query)
                 
                 # Standardize Snowflake sample data specifically
                 standardized_sample_data = []
@@ -242,7 +227,7 @@ class MetricDiscoveryService:
                     WHERE table_name = %s
                 """
                 params = (table_name,)
-                schema_data = connector.query(schema_query, params)
+                schema_data = await connector.aquery(schema_query, params)
 
             logger.info(f"Executing schema query for {type(connector).__name__}")
             
@@ -262,7 +247,7 @@ class MetricDiscoveryService:
 
             # Get sample data with simple query
             sample_query = f"SELECT * FROM {table_name} LIMIT 5"
-            sample_data = connector.query(sample_query)
+            sample_data = await connector.aquery(sample_query)
             
             # Standardize case in sample data
             standardized_sample_data = [
@@ -7,7 +7,7 @@ from openai import OpenAI
 import json
 from sqlalchemy.orm import Session
 from app.models.models import MetricDefinition, AnalyticsConfiguration, DataSourceConnection
-from app.connectors.connector_factory import ConnectorFactory
+from app.connectors.async_connector import async_connectors
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -58,7 +58,7 @@ class QueryGenerationService:
             query = response.choices[0].message.content.strip()
             
             # Validate the generated query
-            self._validate_query(query, connection)
+            await self._validate_query(query, connection)
             
             return query
             
@@ -88,18 +88,12 @@ Requirements:
 
 Return only the SQL query without any explanation."""
 
-    def _validate_query(self, query: str, connection: DataSourceConnection) -> None:
+    async def _validate_query(self, query: str, connection: DataSourceConnection) -> None:
         """Validate the generated query."""
         try:
-            connector = ConnectorFactory.get_connector(
-                connection.source_type,
-                **connection.connection_params
-            )
-            connector.connect()
             # Try executing with EXPLAIN
             explain_query = f"EXPLAIN {query}"
-            connector.query(explain_query)
-            connector.disconnect()
+            await async_connectors.get(connection).aquery(explain_query)
         except Exception as e:
             raise ValueError(f"Invalid query generated: {str(e)}")
 
@@ -130,10 +124,7 @@ class AnalyticsGenerationService:
             if not connection:
                 raise ValueError(f"Connection {config.connection_id} not found")
             
-            connector = ConnectorFactory.get_connector(
-                connection.source_type,
-                **connection.connection_params
-            )
+            connector = async_connectors.get(connection)
             
             # Generate and execute queries for each metric
             for metric in metrics:
@@ -148,17 +139,13 @@ class AnalyticsGenerationService:
                         db=db
                     )
                     
-                    # Execute query
-                    connector.connect()
-                    try:
-                        data = connector.query(query)
-                        metric_results[time_range] = self._process_results(
-                            data,
-                            metric,
-                            time_range
-                        )
-                    finally:
-                        connector.disconnect()
+                    # Off the event loop; a connection is only held while it runs
+                    data = await connector.aquery(query)
+                    metric_results[time_range] = self._process_results(
+                        data,
+                        metric,
+                        time_range
+                    )
                 
                 results[metric.name] = metric_results
             
@@ -1,14 +1,26 @@
 #auth.py
 from passlib.context import CryptContext
+import asyncio
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
+from dataclasses import dataclass
+from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 
-from app.utils.database import get_db  # Change from database import get_db
+from app.utils.database import get_db, get_async_db  # Change from database import get_db
 from app.models.models import User, Organization, user_organizations
 from app.utils.config import settings
+from app.utils.token_cache import token_cache
+from app.utils.revocation import revocation_store
+from app.utils.metrics import PASSWORD_HASH_QUEUE_DEPTH, observe_auth
+import time
 from app.schemas.schemas import UserCreate
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -20,21 +32,192 @@ def verify_password(plain_password, hashed_password):
 def get_password_hash(password):
     return pwd_context.hash(password)
 
-def create_access_token(data: dict):
+class PasswordHasher:
+    """
+    Runs bcrypt hash/verify on a bounded thread pool so a login burst does not
+    block the event loop. At most `max_workers` hashes run at once; the rest
+    wait in the executor queue, whose depth is exposed for monitoring.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hash")
+        self._lock = threading.Lock()
+        self._outstanding = 0
+        self._running = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """Jobs submitted but not yet picked up by a worker."""
+        with self._lock:
+            return self._outstanding - self._running
+
+    @property
+    def in_flight(self) -> int:
+        with self._lock:
+            return self._running
+
+    def _run(self, func, *args):
+        PASSWORD_HASH_QUEUE_DEPTH.dec()
+        with self._lock:
+            self._running += 1
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+
+    def _job_done(self, future):
+        # Fires for completed and cancelled jobs alike
+        if future.cancelled():
+            PASSWORD_HASH_QUEUE_DEPTH.dec()
+        with self._lock:
+            self._outstanding -= 1
+
+    async def _submit(self, func, *args):
+        with self._lock:
+            self._outstanding += 1
+        PASSWORD_HASH_QUEUE_DEPTH.inc()
+        future = self._executor.submit(self._run, func, *args)
+        future.add_done_callback(self._job_done)
+        return await asyncio.wrap_future(future)
+
+    async def verify(self, plain_password, hashed_password) -> bool:
+        return await self._submit(pwd_context.verify, plain_password, hashed_password)
+
+    async def hash(self, password) -> str:
+        return await self._submit(pwd_context.hash, password)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+password_hasher = PasswordHasher(max_workers=settings.PASSWORD_HASH_WORKERS)
+
+async def averify_password(plain_password, hashed_password):
+    return await password_hasher.verify(plain_password, hashed_password)
+
+async def aget_password_hash(password):
+    return await password_hasher.hash(password)
+
+FULL_DATA_ACCESS = "all_departments,all_locations,all_products,financial_data,customer_data,marketing_data,sales_data,employee_data,historical_data,forecasts,system_config,audit_logs"
+
+@dataclass(frozen=True)
+class TokenPrincipal:
+    """Lightweight user built from self-contained token claims, without a DB row."""
+    id: int
+    email: str
+    role: str
+    is_admin: bool
+    is_active: bool
+    data_access: Optional[str]
+
+    @classmethod
+    def from_claims(cls, payload: dict) -> "TokenPrincipal":
+        data_access = payload.get("da")
+        return cls(
+            id=payload["uid"],
+            email=payload["sub"],
+            role=payload.get("role"),
+            is_admin=bool(payload.get("adm")),
+            is_active=bool(payload.get("act")),
+            data_access=FULL_DATA_ACCESS if data_access == "*" else data_access
+        )
+
+def principal_claims(user: User) -> dict:
+    """Claims that let the gateway authorize a request without loading the user."""
+    # The full-access list is by far the most common value; keep tokens small
+    data_access = "*" if user.data_access == FULL_DATA_ACCESS else user.data_access
+    return {
+        "uid": user.id,
+        "role": user.role,
+        "adm": bool(user.is_admin),
+        "act": bool(user.is_active),
+        "da": data_access
+    }
+
+ACCESS_TOKEN_TYPE = "access"
+REFRESH_TOKEN_TYPE = "refresh"
+
+def create_access_token(data: dict, user: Optional[User] = None):
+    """Issue a JWT; with AUTH_STATELESS_TOKENS and a user, embed its principal claims."""
     to_encode = data.copy()
+    if user is not None and settings.AUTH_STATELESS_TOKENS:
+        to_encode.update(principal_claims(user))
     expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex, "typ": ACCESS_TOKEN_TYPE})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
+def create_refresh_token(data: dict):
+    """Issue a long-lived token that can only be exchanged at /authorization/refresh."""
+    expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    to_encode = {
+        "sub": data["sub"],
+        "org_id": data.get("org_id"),
+        "exp": expire,
+        "jti": uuid.uuid4().hex,
+        "typ": REFRESH_TOKEN_TYPE
+    }
+    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+def token_accepted(payload: dict, token_type: str = ACCESS_TOKEN_TYPE) -> bool:
+    """Right kind of token and not revoked; tokens issued before typ/jti count as access tokens."""
+    return (
+        payload.get("typ", ACCESS_TOKEN_TYPE) == token_type
+        and not revocation_store.is_revoked(payload.get("jti"))
+    )
+
+async def revoke_token(payload: dict) -> bool:
+    """Revoke a decoded token until it would have expired; False if it already was."""
+    if not (payload.get("jti") and payload.get("exp")):
+        return False
+    return await revocation_store.revoke(payload["jti"], float(payload["exp"]))
+
+def decode_refresh_token(token: str) -> dict:
+    """Payload of a valid, unrevoked refresh token, or 401."""
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError as e:
+        logging.error(f"Refresh token decode error: {str(e)}")
+        payload = None
+    if payload is None or not payload.get("sub") or not token_accepted(payload, REFRESH_TOKEN_TYPE):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return payload
+
+async def revoke_tokens(access_token: str, refresh_token: Optional[str] = None):
+    """Revoke an access token and, if it belongs to the same user, its refresh token."""
+    try:
+        access_payload = jwt.decode(access_token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError:
+        # Expired or invalid tokens are rejected anyway
+        return
+    await revoke_token(access_payload)
+    if refresh_token:
+        try:
+            refresh_payload = jwt.decode(refresh_token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        except JWTError:
+            return
+        if refresh_payload.get("sub") == access_payload.get("sub"):
+            await revoke_token(refresh_payload)
+
 import logging
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+    started = time.perf_counter()
+    cached_user = token_cache.get(token)
+    if cached_user is not None:
+        observe_auth("cache", started)
+        return cached_user
+
     try:
         logging.info(f"Decoding token: {token}")
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
@@ -45,17 +228,57 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
             raise credentials_exception
         org_id: int = payload.get("org_id")
         logging.info(f"Email: {email}, Org ID: {org_id}")
+        if not token_accepted(payload):
+            logging.error(f"Rejected revoked or non-access token {payload.get('jti')}")
+            raise credentials_exception
     except JWTError as e:
         logging.error(f"JWT decode error: {str(e)}")
         raise credentials_exception
     
-    user = db.query(User).filter((User.email == email) | (User.username == email)).first()
+    # Organizations are loaded eagerly: lazy loads are not available on an AsyncSession
+    result = await db.execute(
+        select(User)
+        .options(selectinload(User.organizations))
+        .where((User.email == email) | (User.username == email))
+    )
+    user = result.scalars().first()
     if user is None:
         logging.error(f"User not found: {email}")
         raise credentials_exception
     logging.info(f"User authenticated: {user.id}")
+    token_cache.put(token, user, org_id, payload.get("exp"), payload.get("jti"))
+    observe_auth("db", started)
     return {"user": user, "current_org_id": org_id}
 
+async def get_current_principal(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
+    """
+    Resolve the caller for endpoints that only need id, role, admin flags and
+    data_access. With AUTH_STATELESS_TOKENS the principal is built from the
+    token claims alone; tokens without claims fall back to get_current_user.
+    """
+    if settings.AUTH_STATELESS_TOKENS:
+        started = time.perf_counter()
+        try:
+            payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        except JWTError as e:
+            logging.error(f"JWT decode error: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Could not validate credentials",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        if not token_accepted(payload):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Could not validate credentials",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        if payload.get("sub") and "uid" in payload:
+            principal = TokenPrincipal.from_claims(payload)
+            observe_auth("claims", started)
+            return {"user": principal, "current_org_id": payload.get("org_id")}
+    return await get_current_user(token, db)
+
 async def get_current_active_user(current_user: dict = Depends(get_current_user)):
     if not current_user["user"].is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
@@ -0,0 +1,142 @@
+#circuit_breaker.py
+import logging
+import time
+from collections import deque
+from typing import Dict
+
+from app.utils.config import settings
+from app.utils.metrics import CIRCUIT_STATE
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+class CircuitBreaker:
+    """
+    Failure-rate circuit breaker for one upstream service.
+
+    The outcome of the last `window_size` calls is kept; once at least
+    `min_requests` are recorded and the failure share reaches
+    `failure_rate_threshold`, the circuit opens and calls are rejected
+    immediately for `open_seconds`. After that, up to `half_open_max_calls`
+    probe calls are let through: a success closes the circuit, a failure
+    opens it again. All access happens on the event loop, so no locking.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate_threshold: float,
+        window_size: int,
+        min_requests: int,
+        open_seconds: float,
+        half_open_max_calls: int
+    ):
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.min_requests = min_requests
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self._outcomes = deque(maxlen=window_size)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        CIRCUIT_STATE.labels(service=name).set(_STATE_VALUES[CLOSED])
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self._transition(HALF_OPEN)
+        return self._state
+
+    @property
+    def failure_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return self._outcomes.count(False) / len(self._outcomes)
+
+    def retry_after(self) -> float:
+        """Seconds until an open circuit starts admitting probe calls."""
+        if self._state != OPEN:
+            return 0.0
+        return max(0.0, self.open_seconds - (time.monotonic() - self._opened_at))
+
+    def allow_request(self) -> bool:
+        """Admit a call; every admitted call must end in record_* or release()."""
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN and self._half_open_calls < self.half_open_max_calls:
+            self._half_open_calls += 1
+            return True
+        return False
+
+    def record_success(self):
+        if self._state == HALF_OPEN:
+            self._transition(CLOSED)
+            return
+        self._outcomes.append(True)
+
+    def record_failure(self):
+        if self._state == HALF_OPEN:
+            self._transition(OPEN)
+            return
+        self._outcomes.append(False)
+        if (
+            self._state == CLOSED
+            and len(self._outcomes) >= self.min_requests
+            and self.failure_rate >= self.failure_rate_threshold
+        ):
+            self._transition(OPEN)
+
+    def release(self):
+        """Give back an admitted call whose outcome says nothing about the upstream."""
+        if self._state == HALF_OPEN and self._half_open_calls > 0:
+            self._half_open_calls -= 1
+
+    def _transition(self, state: str):
+        previous, self._state = self._state, state
+        self._half_open_calls = 0
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+        elif state == CLOSED:
+            self._outcomes.clear()
+        CIRCUIT_STATE.labels(service=self.name).set(_STATE_VALUES[state])
+        logger.warning(f"Circuit for {self.name} changed from {previous} to {state}")
+
+    def snapshot(self) -> dict:
+        return {
+            "state": self.state,
+            "failure_rate": round(self.failure_rate, 3),
+            "window": len(self._outcomes),
+            "retry_after": round(self.retry_after(), 1)
+        }
+
+class CircuitBreakerRegistry:
+    """One breaker per ROUTE_SERVICES entry, created on first use."""
+
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, service_name: str) -> CircuitBreaker:
+        breaker = self._breakers.get(service_name)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                service_name,
+                failure_rate_threshold=settings.GATEWAY_CIRCUIT_FAILURE_RATE,
+                window_size=settings.GATEWAY_CIRCUIT_WINDOW,
+                min_requests=settings.GATEWAY_CIRCUIT_MIN_REQUESTS,
+                open_seconds=settings.GATEWAY_CIRCUIT_OPEN_SECONDS,
+                half_open_max_calls=settings.GATEWAY_CIRCUIT_HALF_OPEN_PROBES
+            )
+            self._breakers[service_name] = breaker
+        return breaker
+
+    def snapshot(self) -> Dict[str, dict]:
+        return {name: breaker.snapshot() for name, breaker in self._breakers.items()}
+
+circuit_breakers = CircuitBreakerRegistry()
@@ -1,6 +1,6 @@
 #services/backend-auth/app/utils/config.py
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import Dict, List, Optional
 from urllib.parse import quote_plus
 from pathlib import Path
 import logging
@@ -16,11 +16,65 @@ class Settings(BaseSettings):
     DB_PORT: str
     DB_USER: str = "postgres"
     DB_SSLMODE: str = "disable"
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_RECYCLE: int = 1800
 
     # JWT settings
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30 
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 14
+
+    # Revoked token ids are kept until their token expires. With REDIS_URL
+    # they are shared between workers, synced every AUTH_REVOCATION_SYNC_SECONDS
+    AUTH_REVOCATION_BLOOM_CAPACITY: int = 100000
+    AUTH_REVOCATION_BLOOM_ERROR_RATE: float = 0.001
+    AUTH_REVOCATION_SYNC_SECONDS: float = 5.0
+
+    # Verified-token cache used by get_current_user, one per process. With
+    # REDIS_URL a changed user is evicted from every worker within
+    # AUTH_REVOCATION_SYNC_SECONDS; without it, and for writes that bypass the
+    # ORM (Core update(), raw SQL), the TTL bounds how long a stale role,
+    # data_access or is_active can be served
+    AUTH_TOKEN_CACHE_ENABLED: bool = True
+    AUTH_TOKEN_CACHE_MAXSIZE: int = 10000
+    AUTH_TOKEN_CACHE_TTL_SECONDS: float = 60.0
+
+    # Embed id/role/is_admin/is_active/data_access in access tokens and trust
+    # them in get_current_principal; claim changes apply on the next token
+    AUTH_STATELESS_TOKENS: bool = False
+
+    # Maximum concurrent bcrypt hash/verify jobs per worker process
+    PASSWORD_HASH_WORKERS: int = 4
+
+    # Largest batch accepted by the bulk user provisioning endpoint
+    BULK_PROVISION_MAX_USERS: int = 5000
+
+    # Pooled connectors per customer data source (app.connectors.connection_pool).
+    # Idle connectors beyond CONNECTOR_POOL_MAX_SIZE are closed, and any idle
+    # longer than CONNECTOR_POOL_IDLE_SECONDS are evicted
+    CONNECTOR_POOL_MAX_SIZE: int = 4
+    CONNECTOR_POOL_IDLE_SECONDS: float = 300.0
+
+    # Shared cache for state that must be consistent across worker processes;
+    # without REDIS_URL each process keeps its own in-memory cache
+    REDIS_URL: Optional[str] = None
+    CACHE_NAMESPACE: str = "backend-auth"
+
+    # Background email delivery. EMAIL_SINK is smtp, file (writes .eml files
+    # to EMAIL_FILE_SINK_DIR) or memory
+    EMAIL_SINK: str = "smtp"
+    EMAIL_FILE_SINK_DIR: str = "/tmp/outbound-email"
+    EMAIL_WORKERS: int = 1
+    EMAIL_QUEUE_SIZE: int = 10000
+    EMAIL_BATCH_SIZE: int = 20
+    EMAIL_MAX_RETRIES: int = 3
+    EMAIL_RETRY_BACKOFF_SECONDS: float = 2.0
+    EMAIL_SMTP_IDLE_SECONDS: float = 60.0
+    # Share compiled email templates across workers and restarts
+    EMAIL_TEMPLATE_CACHE_DIR: Optional[str] = None
 
     # Other settings
     DEBUG: bool = True 
@@ -36,7 +90,54 @@ class Settings(BaseSettings):
     METRIC_DISCOVERY_SERVICE_URL: str  
     METRICS_SERVICE_URL: str  
     ORGANIZATIONS_SERVICE_URL: str  
-    DATA_SOURCE_SERVICE_URL: str  
+    DATA_SOURCE_SERVICE_URL: str
+
+    # Gateway upstream connection pool settings. GATEWAY_SERVICE_TIMEOUTS
+    # overrides the total timeout per ROUTE_SERVICES entry, e.g.
+    # '{"chatbot": 120, "metrics": 20}'
+    GATEWAY_TIMEOUT_SECONDS: float = 60.0
+    GATEWAY_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    GATEWAY_SERVICE_TIMEOUTS: Dict[str, float] = {}
+    GATEWAY_MAX_CONNECTIONS: int = 100
+    GATEWAY_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    GATEWAY_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    GATEWAY_HTTP2: bool = False
+
+    # Seconds to wait for in-flight proxied requests on shutdown
+    GATEWAY_DRAIN_TIMEOUT_SECONDS: float = 25.0
+
+    # Per-upstream circuit breakers
+    GATEWAY_CIRCUIT_FAILURE_RATE: float = 0.5
+    GATEWAY_CIRCUIT_WINDOW: int = 20
+    GATEWAY_CIRCUIT_MIN_REQUESTS: int = 10
+    GATEWAY_CIRCUIT_OPEN_SECONDS: float = 30.0
+    GATEWAY_CIRCUIT_HALF_OPEN_PROBES: int = 1
+
+    # Background upstream health probes
+    GATEWAY_HEALTH_INTERVAL_SECONDS: float = 15.0
+    GATEWAY_HEALTH_TIMEOUT_SECONDS: float = 5.0
+
+    # Relay upstream bytes without buffering; request bodies at or above
+    # GATEWAY_STREAM_REQUEST_MIN_BYTES (or of unknown length) are streamed too
+    GATEWAY_STREAMING: bool = False
+    GATEWAY_STREAM_REQUEST_MIN_BYTES: int = 1048576
+
+    # Cache for proxied GETs to the listed ROUTE_SERVICES entries. Upstream
+    # Cache-Control wins; GATEWAY_RESPONSE_CACHE_DEFAULT_TTL_SECONDS applies when
+    # it sends none. Entries are per user unless the upstream marks a response
+    # public or gives it an s-maxage. Entries with an ETag are kept GATEWAY_RESPONSE_CACHE_STALE_SECONDS
+    # past expiry so they can be revalidated with If-None-Match. Bypassed while
+    # GATEWAY_STREAMING is on, since streamed responses are never buffered
+    GATEWAY_RESPONSE_CACHE_ENABLED: bool = False
+    GATEWAY_RESPONSE_CACHE_SERVICES: List[str] = ["metrics", "narrative"]
+    GATEWAY_RESPONSE_CACHE_DEFAULT_TTL_SECONDS: float = 30.0
+    GATEWAY_RESPONSE_CACHE_STALE_SECONDS: float = 300.0
+    GATEWAY_RESPONSE_CACHE_MAX_BYTES: int = 67108864
+    GATEWAY_RESPONSE_CACHE_MAX_ENTRY_BYTES: int = 1048576
+
+    # Share one upstream call between identical concurrent proxied GETs
+    # (same path, query and org/role/data-access context). Buffered mode only
+    GATEWAY_COALESCE_GETS: bool = False
 
 
     @property
@@ -44,6 +145,10 @@ class Settings(BaseSettings):
         url = f"postgresql://{self.DB_USER}:{quote_plus(self.DB_PASSWORD)}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}?sslmode={self.DB_SSLMODE}"
         return url
 
+    @property
+    def ASYNC_DATABASE_URL(self):
+        return f"postgresql+asyncpg://{self.DB_USER}:{quote_plus(self.DB_PASSWORD)}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
+
     @property
     def ALLOWED_HOSTS_LIST(self) -> List[str]:
         return [host.strip() for host in self.ALLOWED_HOSTS.split(',')]
@@ -0,0 +1,108 @@
+#health.py
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Dict, Optional
+
+from app.utils.config import settings
+from app.utils.http_client import service_clients
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class ServiceStatus:
+    url: Optional[str]
+    configured: bool
+    healthy: Optional[bool] = None  # None until the first probe completes
+    latency_ms: Optional[float] = None
+    last_checked: Optional[str] = None
+    last_success: Optional[str] = None
+    last_failure: Optional[str] = None
+    error: Optional[str] = None
+
+class ServiceHealthMonitor:
+    """
+    Probes every upstream's /health endpoint concurrently on a fixed interval
+    and keeps the latest result per service, so health endpoints answer from
+    memory instead of waiting on slow or dead upstreams.
+    """
+
+    def __init__(self, services: Dict[str, str], interval: float, timeout: float):
+        self.interval = interval
+        self.timeout = timeout
+        self._statuses: Dict[str, ServiceStatus] = {
+            name: ServiceStatus(url=url, configured=bool(url))
+            for name, url in services.items()
+        }
+        self._task: Optional[asyncio.Task] = None
+
+    async def probe(self, service_name: str):
+        status = self._statuses[service_name]
+        if not status.configured:
+            status.healthy = False
+            status.error = "Service URL not configured"
+            return
+
+        started = time.perf_counter()
+        now = datetime.utcnow().isoformat()
+        try:
+            client = service_clients.get(service_name)
+            response = await client.get(f"{status.url.rstrip('/')}/health", timeout=self.timeout)
+            healthy = response.status_code == 200
+            error = None if healthy else f"Health check returned {response.status_code}"
+        except Exception as e:
+            healthy = False
+            error = str(e) or type(e).__name__
+
+        status.latency_ms = round((time.perf_counter() - started) * 1000, 2)
+        status.last_checked = now
+        status.healthy = healthy
+        status.error = error
+        if healthy:
+            status.last_success = now
+        else:
+            status.last_failure = now
+            logger.error(f"Health check failed for {service_name}: {error}")
+
+    async def probe_all(self):
+        await asyncio.gather(*(self.probe(name) for name in self._statuses))
+
+    async def _run(self):
+        while True:
+            try:
+                await self.probe_all()
+            except Exception as e:
+                logger.exception(f"Health probe cycle failed: {str(e)}")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def snapshot(self) -> Dict[str, dict]:
+        return {name: asdict(status) for name, status in self._statuses.items()}
+
+    @property
+    def overall_status(self) -> str:
+        """'degraded' once any configured upstream has failed its latest probe."""
+        if any(status.configured and status.healthy is False for status in self._statuses.values()):
+            return "degraded"
+        return "healthy"
+
+def create_health_monitor(services: Dict[str, str]) -> ServiceHealthMonitor:
+    return ServiceHealthMonitor(
+        services,
+        interval=settings.GATEWAY_HEALTH_INTERVAL_SECONDS,
+        timeout=settings.GATEWAY_HEALTH_TIMEOUT_SECONDS
+    )
@@ -0,0 +1,88 @@
+#http_client.py
+import asyncio
+import httpx
+import logging
+from typing import Dict, Optional
+
+from app.utils.config import settings
+
+logger = logging.getLogger(__name__)
+
+class ServiceClientRegistry:
+    """Pooled httpx clients for the gateway, one per ROUTE_SERVICES entry."""
+
+    def __init__(self):
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._in_flight = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def request_started(self):
+        self._in_flight += 1
+        self._idle.clear()
+
+    def request_finished(self):
+        self._in_flight -= 1
+        if self._in_flight <= 0:
+            self._in_flight = 0
+            self._idle.set()
+
+    async def drain(self, timeout: float):
+        """Wait for in-flight proxied requests to finish, up to `timeout` seconds."""
+        if self._in_flight == 0:
+            return
+        logger.info(f"Draining {self._in_flight} in-flight proxied request(s)")
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Drain timed out with {self._in_flight} request(s) still in flight")
+
+    @staticmethod
+    def timeout_for(service_name: Optional[str]) -> httpx.Timeout:
+        """Per-service timeout budget; connects always fail fast."""
+        budget = settings.GATEWAY_SERVICE_TIMEOUTS.get(service_name, settings.GATEWAY_TIMEOUT_SECONDS)
+        return httpx.Timeout(budget, connect=min(settings.GATEWAY_CONNECT_TIMEOUT_SECONDS, budget))
+
+    def _build_client(self, service_name: Optional[str] = None) -> httpx.AsyncClient:
+        limits = httpx.Limits(
+            max_connections=settings.GATEWAY_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.GATEWAY_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.GATEWAY_KEEPALIVE_EXPIRY_SECONDS
+        )
+        return httpx.AsyncClient(
+            timeout=self.timeout_for(service_name),
+            follow_redirects=True,
+            limits=limits,
+            http2=settings.GATEWAY_HTTP2
+        )
+
+    async def startup(self, services: Dict[str, str]):
+        """Create a client for every configured service."""
+        for service_name, service_url in services.items():
+            if service_url and service_name not in self._clients:
+                self._clients[service_name] = self._build_client(service_name)
+        logger.info(f"Initialized pooled HTTP clients for: {', '.join(self._clients)}")
+
+    async def shutdown(self):
+        """Close all pooled clients and release their connections."""
+        for service_name, client in self._clients.items():
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.error(f"Error closing HTTP client for {service_name}: {str(e)}")
+        self._clients.clear()
+
+    def get(self, service_name: Optional[str]) -> httpx.AsyncClient:
+        """Return the pooled client for a service, creating it lazily if needed."""
+        key = service_name or "_default"
+        client = self._clients.get(key)
+        if client is None or client.is_closed:
+            client = self._build_client(service_name)
+            self._clients[key] = client
+        return client
+
+service_clients = ServiceClientRegistry()
@@ -0,0 +1,178 @@
+#metrics.py
+import os
+import time
+from typing import AsyncIterator
+
+from prometheus_client import (
+    REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
+)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Inbound gateway traffic
+REQUEST_LATENCY = Histogram(
+    "gateway_request_duration_seconds",
+    "Time spent serving a gateway request",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "gateway_requests_in_flight",
+    "Gateway requests currently being served",
+    multiprocess_mode="livesum"
+)
+REQUEST_BYTES = Counter(
+    "gateway_request_bytes_total",
+    "Request body bytes received from clients",
+    ["route"]
+)
+RESPONSE_BYTES = Counter(
+    "gateway_response_bytes_total",
+    "Response body bytes sent to clients",
+    ["route"]
+)
+
+# Upstream (proxied) traffic
+UPSTREAM_LATENCY = Histogram(
+    "gateway_upstream_duration_seconds",
+    "Time until an upstream service returned its response",
+    ["service", "method", "status"],
+    buckets=LATENCY_BUCKETS
+)
+UPSTREAM_IN_FLIGHT = Gauge(
+    "gateway_upstream_requests_in_flight",
+    "Proxied requests waiting on an upstream service",
+    ["service"],
+    multiprocess_mode="livesum"
+)
+UPSTREAM_ERRORS = Counter(
+    "gateway_upstream_errors_total",
+    "Upstream transport failures and 5xx responses",
+    ["service", "reason"]
+)
+UPSTREAM_REQUEST_BYTES = Counter(
+    "gateway_upstream_request_bytes_total",
+    "Request body bytes sent to upstream services",
+    ["service"]
+)
+UPSTREAM_RESPONSE_BYTES = Counter(
+    "gateway_upstream_response_bytes_total",
+    "Response body bytes received from upstream services",
+    ["service"]
+)
+
+CIRCUIT_STATE = Gauge(
+    "gateway_circuit_state",
+    "Upstream circuit breaker state (0=closed, 1=half-open, 2=open)",
+    ["service"],
+    multiprocess_mode="livemax"
+)
+
+RESPONSE_CACHE_REQUESTS = Counter(
+    "gateway_response_cache_requests_total",
+    "Cacheable proxied GETs by outcome (hit, miss, revalidated, bypass)",
+    ["service", "result"]
+)
+
+COALESCED_REQUESTS = Counter(
+    "gateway_coalesced_requests_total",
+    "Identical concurrent proxied GETs; 'leader' made the upstream call, 'follower' shared it",
+    ["service", "role"]
+)
+
+# Authentication
+AUTH_LATENCY = Histogram(
+    "gateway_auth_duration_seconds",
+    "Time spent resolving the current user",
+    ["source"],
+    buckets=LATENCY_BUCKETS
+)
+
+# Password hashing pool (see app.utils.auth.PasswordHasher)
+PASSWORD_HASH_QUEUE_DEPTH = Gauge(
+    "gateway_password_hash_queue_depth",
+    "bcrypt jobs waiting for a free worker",
+    multiprocess_mode="livesum"
+)
+
+# Outbound email (see app.services.email_dispatcher)
+EMAIL_DELIVERIES = Counter(
+    "gateway_email_deliveries_total",
+    "Outbound email delivery attempts by result (sent, retried, failed, dropped)",
+    ["result"]
+)
+EMAIL_QUEUE_DEPTH = Gauge(
+    "gateway_email_queue_depth",
+    "Emails waiting for a dispatcher worker",
+    multiprocess_mode="livesum"
+)
+
+def status_class(status_code: int) -> str:
+    return f"{status_code // 100}xx"
+
+def observe_auth(source: str, started: float):
+    """Record time spent in get_current_user; source is cache, claims or db."""
+    AUTH_LATENCY.labels(source=source).observe(time.perf_counter() - started)
+
+async def count_upstream_bytes(chunks: AsyncIterator[bytes], service: str) -> AsyncIterator[bytes]:
+    """Pass a streamed upstream body through while counting its size."""
+    counter = UPSTREAM_RESPONSE_BYTES.labels(service=service)
+    async for chunk in chunks:
+        counter.inc(len(chunk))
+        yield chunk
+
+def render_metrics() -> bytes:
+    # Under gunicorn every worker writes its samples to PROMETHEUS_MULTIPROC_DIR;
+    # aggregate them so a scrape sees the whole container, not one worker
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency, in-flight count and body sizes per route."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+        bytes_in = 0
+        bytes_out = 0
+
+        async def receive_wrapper():
+            nonlocal bytes_in
+            message = await receive()
+            if message["type"] == "http.request":
+                bytes_in += len(message.get("body", b""))
+            return message
+
+        async def send_wrapper(message):
+            nonlocal status_code, bytes_out
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                bytes_out += len(message.get("body", b""))
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+            # Use the route template, not the raw path, to keep label cardinality bounded
+            route = scope.get("route")
+            route_label = getattr(route, "path", "unmatched")
+            REQUEST_LATENCY.labels(
+                method=scope["method"],
+                route=route_label,
+                status=status_class(status_code)
+            ).observe(time.perf_counter() - started)
+            REQUEST_BYTES.labels(route=route_label).inc(bytes_in)
+            RESPONSE_BYTES.labels(route=route_label).inc(bytes_out)
@@ -0,0 +1,65 @@
+#pagination.py
+import base64
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator, Iterable, List
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_, tuple_
+
+def encode_cursor(*values: Any) -> str:
+    """Opaque keyset cursor for the sort key of the last row on a page."""
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str, *types) -> List[Any]:
+    """Decode a cursor from encode_cursor, converting each value with `types`."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if len(payload) != len(types):
+            raise ValueError("unexpected cursor length")
+        return [
+            None if value is None else datetime.fromisoformat(value) if cast is datetime else cast(value)
+            for cast, value in zip(types, payload)
+        ]
+    except (ValueError, TypeError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid cursor: {str(e)}")
+
+def keyset_order(column, id_column, descending: bool = False):
+    """
+    ORDER BY for keyset pagination on a nullable column with an id tiebreaker.
+    NULLs sort as the largest value, as PostgreSQL does by default, so an
+    index on (column, id) still serves the query in either direction.
+    """
+    if descending:
+        return column.desc().nullsfirst(), id_column.desc()
+    return column.asc().nullslast(), id_column.asc()
+
+def keyset_after(column, id_column, value: Any, row_id: Any, descending: bool = False):
+    """WHERE clause for the rows after (value, row_id) in keyset_order."""
+    if descending:
+        if value is None:
+            return or_(column.isnot(None), and_(column.is_(None), id_column < row_id))
+        return tuple_(column, id_column) < tuple_(value, row_id)
+    if value is None:
+        return and_(column.is_(None), id_column > row_id)
+    return or_(tuple_(column, id_column) > tuple_(value, row_id), column.is_(None))
+
+async def stream_json_array(batches: AsyncIterator[Iterable[dict]]) -> AsyncIterator[bytes]:
+    """Encode batches of items as one JSON array, a batch per chunk."""
+    yield b"["
+    first = True
+    async for batch in batches:
+        encoded = ",".join(json.dumps(item, default=str) for item in batch)
+        if not encoded:
+            continue
+        yield (encoded if first else "," + encoded).encode()
+        first = False
+    yield b"]"
+
+async def stream_ndjson(batches: AsyncIterator[Iterable[dict]]) -> AsyncIterator[bytes]:
+    """Encode batches of items as newline-delimited JSON, a batch per chunk."""
+    async for batch in batches:
+        encoded = "".join(json.dumps(item, default=str) + "\n" for item in batch)
+        if encoded:
+            yield encoded.encode()
@@ -0,0 +1,208 @@
+#query_plans.py
+"""
+Query-plan regression check for the gateway's hot queries.
+
+    python -m app.utils.query_plans --database-url URL [--no-seed] [--allow-remote]
+
+By default the models are created in a scratch schema of a local Postgres,
+seeded with synthetic data and analyzed. Each hot query is then EXPLAINed,
+and the run fails when a plan reads one of HOT_TABLES with a sequential
+scan. With --no-seed the queries are explained against the existing tables
+instead, e.g. after applying deployment/migrations. Seeding drops and
+recreates the scratch schema, so it refuses non-local hosts unless
+--allow-remote is given.
+"""
+import argparse
+import logging
+import random
+import sys
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.dialects import postgresql
+
+from app.models.models import Article, InteractionHistory, LikedPost, Organization, User, user_organizations
+from app.utils.database import Base
+
+logger = logging.getLogger(__name__)
+
+LOCAL_HOSTS = {None, "", "localhost", "127.0.0.1", "::1"}
+HOT_TABLES = {"users", "user_organizations", "interaction_history", "liked_posts", "articles"}
+SCRATCH_SCHEMA = "plan_check"
+
+SEED_ORGANIZATIONS = 10
+SEED_USERS = 5000
+SEED_ARTICLES = 5000
+SEED_LIKES_PER_USER = 10
+SEED_SESSIONS_PER_USER = 4
+SEED_INTERACTIONS_PER_SESSION = 5
+INSERT_BATCH_SIZE = 5000
+
+def _insert(conn, table, rows: List[dict]):
+    for i in range(0, len(rows), INSERT_BATCH_SIZE):
+        conn.execute(table.insert(), rows[i:i + INSERT_BATCH_SIZE])
+
+def seed(engine) -> dict:
+    """Create the models in the scratch schema, fill them and return sample keys."""
+    rng = random.Random(0)
+    started = datetime(2024, 1, 1)
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        _insert(conn, Organization.__table__, [
+            {"id": org_id, "name": f"org-{org_id}", "is_demo": False}
+            for org_id in range(1, SEED_ORGANIZATIONS + 1)
+        ])
+        _insert(conn, User.__table__, [
+            {
+                "id": user_id,
+                "username": f"user{user_id}",
+                "email": f"user{user_id}@example.com",
+                "hashed_password": "x",
+                "role": "member"
+            } for user_id in range(1, SEED_USERS + 1)
+        ])
+        _insert(conn, user_organizations, [
+            {"user_id": user_id, "organization_id": user_id % SEED_ORGANIZATIONS + 1, "role": "member"}
+            for user_id in range(1, SEED_USERS + 1)
+        ])
+        article_ids = [uuid.UUID(int=rng.getrandbits(128)) for _ in range(SEED_ARTICLES)]
+        _insert(conn, Article.__table__, [
+            {
+                "id": article_id,
+                "date": started.date(),
+                "title": f"article {i}",
+                "content": "",
+                "category": "metrics",
+                "time_period": "weekly",
+                "graph_data": {},
+                "organization_id": i % SEED_ORGANIZATIONS + 1
+            } for i, article_id in enumerate(article_ids)
+        ])
+        _insert(conn, LikedPost.__table__, [
+            {
+                "user_id": user_id,
+                "article_id": article_id,
+                "liked_at": started + timedelta(minutes=rng.randrange(500000))
+            }
+            for user_id in range(1, SEED_USERS + 1)
+            for article_id in rng.sample(article_ids, SEED_LIKES_PER_USER)
+        ])
+        sessions = [
+            (user_id, uuid.UUID(int=rng.getrandbits(128)), started + timedelta(minutes=rng.randrange(500000)))
+            for user_id in range(1, SEED_USERS + 1)
+            for _ in range(SEED_SESSIONS_PER_USER)
+        ]
+        _insert(conn, InteractionHistory.__table__, [
+            {
+                "user_id": user_id,
+                "session_id": session_id,
+                "question": "q",
+                "answer": "a",
+                "timestamp": session_start + timedelta(minutes=turn)
+            }
+            for user_id, session_id, session_start in sessions
+            for turn in range(SEED_INTERACTIONS_PER_SESSION)
+        ])
+    with engine.begin() as conn:
+        conn.exec_driver_sql("ANALYZE")
+    return sample(engine)
+
+def sample(engine) -> dict:
+    """Keys of existing rows to plug into the hot queries."""
+    with engine.connect() as conn:
+        interaction = conn.execute(
+            select(InteractionHistory.id, InteractionHistory.user_id, InteractionHistory.session_id,
+                   InteractionHistory.timestamp)
+            .order_by(InteractionHistory.id.desc()).limit(1)
+        ).first()
+        like = conn.execute(
+            select(LikedPost.id, LikedPost.user_id, LikedPost.liked_at, Article.organization_id)
+            .join(Article, Article.id == LikedPost.article_id)
+            .order_by(LikedPost.id.desc()).limit(1)
+        ).first()
+        user = conn.execute(select(User.id, User.email).order_by(User.id.desc()).limit(1)).first()
+    if interaction is None or like is None or user is None:
+        raise RuntimeError("Need at least one user, interaction and liked post to explain against")
+    return {"interaction": interaction, "like": like, "user": user}
+
+def hot_queries(keys: dict) -> Dict[str, object]:
+    # Imported here: app.main builds the whole application on import
+    from app.main import chat_history_query, liked_posts_query
+    from app.utils.pagination import encode_cursor
+
+    interaction, like, user = keys["interaction"], keys["like"], keys["user"]
+    return {
+        "login_lookup": select(User).where((User.email == user.email) | (User.username == user.email)),
+        "user_organizations": select(user_organizations).where(user_organizations.c.user_id.in_([user.id])),
+        "chat_history": chat_history_query(interaction.user_id, interaction.session_id),
+        "chat_history_page": chat_history_query(
+            interaction.user_id, interaction.session_id,
+            encode_cursor(interaction.timestamp, interaction.id)
+        ).limit(51),
+        "liked_posts": liked_posts_query(like.user_id, like.organization_id).limit(51),
+        "liked_posts_page": liked_posts_query(
+            like.user_id, like.organization_id,
+            cursor=encode_cursor(like.liked_at, like.id)
+        ).limit(51),
+    }
+
+def sequential_scans(plan: dict) -> List[str]:
+    """Hot tables read by a Seq Scan anywhere in an EXPLAIN (FORMAT JSON) plan."""
+    found = []
+    if plan.get("Node Type") == "Seq Scan" and plan.get("Relation Name") in HOT_TABLES:
+        found.append(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        found.extend(sequential_scans(child))
+    return found
+
+def check(engine, keys: dict) -> List[str]:
+    failures = []
+    with engine.connect() as conn:
+        for name, statement in hot_queries(keys).items():
+            sql = str(statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+            plan = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}").scalar()[0]["Plan"]
+            scans = sequential_scans(plan)
+            if scans:
+                failures.append(f"{name}: sequential scan on {', '.join(sorted(set(scans)))}")
+                logger.error(f"FAIL {failures[-1]}")
+            else:
+                logger.info(f"ok   {name}: {plan['Node Type']} (cost {plan['Total Cost']})")
+    return failures
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", required=True,
+                        help="Postgres to run against")
+    parser.add_argument("--no-seed", action="store_true",
+                        help="Explain against the existing tables instead of a seeded scratch schema")
+    parser.add_argument("--allow-remote", action="store_true",
+                        help="Seed a scratch schema on a non-local host")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    host = make_url(args.database_url).host
+    if not args.no_seed and not args.allow_remote and host not in LOCAL_HOSTS:
+        parser.error(f"refusing to seed a scratch schema on {host}; pass --allow-remote to do so")
+
+    if args.no_seed:
+        engine = create_engine(args.database_url)
+        return 1 if check(engine, sample(engine)) else 0
+
+    admin = create_engine(args.database_url, isolation_level="AUTOCOMMIT")
+    with admin.connect() as conn:
+        conn.exec_driver_sql(f"DROP SCHEMA IF EXISTS {SCRATCH_SCHEMA} CASCADE")
+        conn.exec_driver_sql(f"CREATE SCHEMA {SCRATCH_SCHEMA}")
+    engine = create_engine(args.database_url, connect_args={"options": f"-csearch_path={SCRATCH_SCHEMA}"})
+    try:
+        failures = check(engine, seed(engine))
+    finally:
+        engine.dispose()
+        with admin.connect() as conn:
+            conn.exec_driver_sql(f"DROP SCHEMA IF EXISTS {SCRATCH_SCHEMA} CASCADE")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,263 @@
+#response_cache.py
+import hashlib
+import json
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple
+
+from fastapi import Request, Response
+
+from app.utils.config import settings
+from app.utils.metrics import RESPONSE_CACHE_REQUESTS
+from app.utils.shared_cache import CacheBackend, create_cache_backend
+
+logger = logging.getLogger(__name__)
+
+# Headers that describe one particular transfer and must not be replayed
+_UNCACHED_HEADERS = {"content-length", "transfer-encoding", "connection", "date", "age", "x-cache"}
+
+def parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    """Parse a Cache-Control header into {directive: argument or None}."""
+    directives = {}
+    for part in (value or "").split(","):
+        name, _, argument = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = argument.strip('"') or None
+    return directives
+
+def _seconds(value: Optional[str]) -> Optional[float]:
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+def request_context_key(
+    request: Request,
+    service_name: str,
+    path: str,
+    current_user: Optional[Dict],
+    private: bool = False,
+    vary: Sequence[str] = ()
+) -> str:
+    """
+    Digest of a proxied request and the X-User-* context it is forwarded
+    with. The user id is only part of the key when `private` is set; `vary`
+    names request headers that also distinguish requests.
+    """
+    user = current_user["user"] if current_user else None
+    parts = [
+        request.method,
+        service_name,
+        path,
+        sorted(request.query_params.multi_items()),
+        str(current_user["current_org_id"]) if current_user else None,
+        getattr(user, "role", None),
+        getattr(user, "data_access", None),
+        str(user.id) if private and user is not None else None,
+        [request.headers.get(name) for name in vary]
+    ]
+    return hashlib.sha256(json.dumps(parts).encode()).hexdigest()
+
+@dataclass
+class CachedResponse:
+    key: str
+    status_code: int
+    headers: Dict[str, str]
+    body: bytes
+    stored_at: float
+    max_age: float
+
+    @property
+    def etag(self) -> Optional[str]:
+        return self.headers.get("etag")
+
+    def age(self) -> float:
+        return max(0.0, time.time() - self.stored_at)
+
+    def is_fresh(self) -> bool:
+        return self.age() < self.max_age
+
+    def to_bytes(self) -> bytes:
+        """JSON metadata, a newline, then the raw body; see shared_cache.encode_value."""
+        meta = {
+            "key": self.key,
+            "status_code": self.status_code,
+            "headers": self.headers,
+            "stored_at": self.stored_at,
+            "max_age": self.max_age
+        }
+        return json.dumps(meta, separators=(",", ":")).encode() + b"\n" + self.body
+
+    @classmethod
+    def from_bytes(cls, raw: bytes) -> "CachedResponse":
+        meta, _, body = raw.partition(b"\n")
+        return cls(body=body, **json.loads(meta))
+
+class ResponseCache:
+    """
+    Cache for idempotent proxied GETs.
+
+    Entries are keyed by service, path, sorted query parameters and the
+    caller's organization, role, data access and user id, i.e. everything the
+    gateway forwards to the upstream as X-User-* context. Only responses the
+    upstream marks `public` or gives an `s-maxage` are shared between the
+    users of one context; anything else may depend on X-User-ID. Stale entries with an ETag are
+    revalidated upstream with If-None-Match instead of being refetched.
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        services,
+        default_ttl: float,
+        stale_seconds: float,
+        max_entry_bytes: int,
+        enabled: bool = True
+    ):
+        self.backend = backend
+        self.services = set(services)
+        self.default_ttl = default_ttl
+        self.stale_seconds = stale_seconds
+        self.max_entry_bytes = max_entry_bytes
+        self.enabled = enabled
+
+    def applies_to(self, request: Request, service_name: str) -> bool:
+        if not self.enabled or request.method != "GET" or service_name not in self.services:
+            return False
+        if "no-store" in parse_cache_control(request.headers.get("cache-control")):
+            RESPONSE_CACHE_REQUESTS.labels(service=service_name, result="bypass").inc()
+            return False
+        return True
+
+    @staticmethod
+    def must_revalidate(request: Request) -> bool:
+        return "no-cache" in parse_cache_control(request.headers.get("cache-control"))
+
+    @staticmethod
+    def build_key(
+        request: Request,
+        service_name: str,
+        path: str,
+        current_user: Optional[Dict],
+        private: bool = False
+    ) -> str:
+        return request_context_key(request, service_name, path, current_user, private=private)
+
+    async def _get(self, key: str) -> Optional[CachedResponse]:
+        raw = await self.backend.get(key)
+        if raw is None:
+            return None
+        try:
+            return CachedResponse.from_bytes(raw)
+        except Exception as e:
+            logger.warning(f"Dropping unreadable response cache entry {key}: {str(e)}")
+            await self.backend.delete(key)
+            return None
+
+    async def lookup(
+        self,
+        request: Request,
+        service_name: str,
+        path: str,
+        current_user: Optional[Dict]
+    ) -> Optional[CachedResponse]:
+        """Shared entry for the caller's context first, then the caller's own one."""
+        entry = await self._get(self.build_key(request, service_name, path, current_user))
+        if entry is None and current_user:
+            entry = await self._get(self.build_key(request, service_name, path, current_user, private=True))
+        return entry
+
+    def _freshness(self, headers) -> Optional[Tuple[float, bool]]:
+        """(max_age, shared) for a storable response, None otherwise."""
+        directives = parse_cache_control(headers.get("cache-control"))
+        if "no-store" in directives or "set-cookie" in headers or headers.get("vary", "").strip() == "*":
+            return None
+        private = "private" in directives
+        shared = not private and ("public" in directives or "s-maxage" in directives)
+        if "no-cache" in directives:
+            max_age = 0.0
+        elif not private and _seconds(directives.get("s-maxage")) is not None:
+            max_age = _seconds(directives["s-maxage"])
+        elif _seconds(directives.get("max-age")) is not None:
+            max_age = _seconds(directives["max-age"])
+        else:
+            max_age = self.default_ttl
+        if max_age <= 0 and "etag" not in headers:
+            return None
+        return max_age, shared
+
+    async def _put(self, entry: CachedResponse):
+        ttl = entry.max_age + (self.stale_seconds if entry.etag else 0)
+        await self.backend.set(entry.key, entry.to_bytes(), ttl=ttl)
+
+    async def store(
+        self,
+        request: Request,
+        service_name: str,
+        path: str,
+        current_user: Optional[Dict],
+        response: Response
+    ) -> Optional[CachedResponse]:
+        """Cache a buffered 200 response if its headers allow it."""
+        body = getattr(response, "body", None)
+        if response.status_code != 200 or body is None or len(body) > self.max_entry_bytes:
+            return None
+        freshness = self._freshness(response.headers)
+        if freshness is None:
+            return None
+        max_age, shared = freshness
+        entry = CachedResponse(
+            key=self.build_key(request, service_name, path, current_user, private=not shared),
+            status_code=response.status_code,
+            headers={k: v for k, v in response.headers.items() if k not in _UNCACHED_HEADERS},
+            body=body,
+            stored_at=time.time(),
+            max_age=max_age
+        )
+        await self._put(entry)
+        return entry
+
+    async def refresh(self, entry: CachedResponse, not_modified: Response) -> CachedResponse:
+        """Restart an entry's lifetime after the upstream answered 304."""
+        for name in ("cache-control", "etag", "expires"):
+            if name in not_modified.headers:
+                entry.headers[name] = not_modified.headers[name]
+        freshness = self._freshness(entry.headers)
+        entry.max_age = freshness[0] if freshness else 0.0
+        entry.stored_at = time.time()
+        if freshness is None:
+            await self.backend.delete(entry.key)
+        else:
+            await self._put(entry)
+        return entry
+
+    @staticmethod
+    def revalidation_headers(entry: Optional[CachedResponse]) -> Dict[str, str]:
+        if entry is None or not entry.etag:
+            return {}
+        return {"if-none-match": entry.etag}
+
+    @staticmethod
+    def serve(entry: CachedResponse, request: Request, result: str) -> Response:
+        headers = dict(entry.headers)
+        headers["age"] = str(int(entry.age()))
+        headers["x-cache"] = result.upper()
+        client_etags = request.headers.get("if-none-match")
+        if entry.etag and client_etags and (
+            client_etags.strip() == "*"
+            or entry.etag in [tag.strip() for tag in client_etags.split(",")]
+        ):
+            headers.pop("content-type", None)
+            return Response(status_code=304, headers=headers)
+        return Response(content=entry.body, status_code=entry.status_code, headers=headers)
+
+def create_response_cache() -> ResponseCache:
+    return ResponseCache(
+        create_cache_backend("gateway-responses", max_bytes=settings.GATEWAY_RESPONSE_CACHE_MAX_BYTES),
+        services=settings.GATEWAY_RESPONSE_CACHE_SERVICES,
+        default_ttl=settings.GATEWAY_RESPONSE_CACHE_DEFAULT_TTL_SECONDS,
+        stale_seconds=settings.GATEWAY_RESPONSE_CACHE_STALE_SECONDS,
+        max_entry_bytes=settings.GATEWAY_RESPONSE_CACHE_MAX_ENTRY_BYTES,
+        enabled=settings.GATEWAY_RESPONSE_CACHE_ENABLED
+    )
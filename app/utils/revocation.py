@@ -0,0 +1,232 @@
+#revocation.py
+import asyncio
+import hashlib
+import logging
+import math
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+from app.utils.config import settings
+
+logger = logging.getLogger(__name__)
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings; no deletes, rebuild to shrink."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = max(1, capacity)
+        self.size = max(8, math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / self.capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.sha256(item.encode()).digest()
+        first = int.from_bytes(digest[:8], "big")
+        second = int.from_bytes(digest[8:16], "big") | 1
+        return ((first + i * second) % self.size for i in range(self.hash_count))
+
+    def add(self, item: str):
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+class RevocationStore:
+    """
+    Revoked token ids (jti) until their token expires.
+
+    Lookups hit a Bloom filter first, so the common not-revoked case costs a
+    few hashes; positives are confirmed against the exact jti -> exp map.
+    Expired entries are evicted and the filter rebuilt on prune(). With
+    REDIS_URL, revocations are also written to a Redis sorted set scored by
+    expiry and every worker reloads it each `sync_interval` seconds, so a
+    revocation reaches other workers within that interval. Without Redis
+    every process has its own revocations.
+
+    Changed users are broadcast the same way (see invalidate_users), so every
+    worker's verified-token cache drops principals cached before the change.
+    They are kept for `user_retention` seconds, the longest a principal stays
+    cached.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        error_rate: float,
+        redis_url: Optional[str] = None,
+        namespace: str = "revoked-tokens",
+        sync_interval: float = 5.0,
+        user_retention: float = 60.0
+    ):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_interval = sync_interval
+        self.user_retention = user_retention
+        self._revoked: Dict[str, float] = {}
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._lock = threading.Lock()
+        self._redis = None
+        self._redis_key = namespace
+        self._users_key = f"{namespace}:users"
+        # user id -> when it last changed; unpublished ones still need a ZADD
+        self._invalidated_users: Dict[int, float] = {}
+        self._unpublished_users: Dict[int, float] = {}
+        self._redis_url = redis_url
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        if not jti or jti not in self._bloom:
+            return False
+        expires_at = self._revoked.get(jti)
+        return expires_at is not None and expires_at > time.time()
+
+    def _add(self, jti: str, expires_at: float) -> bool:
+        """Record a revocation; False if `jti` was already revoked here."""
+        with self._lock:
+            if self._revoked.get(jti, 0) > time.time():
+                return False
+            self._revoked[jti] = expires_at
+            if len(self._revoked) > self._bloom.capacity:
+                self._rebuild(capacity=self._bloom.capacity * 2)
+            else:
+                self._bloom.add(jti)
+            return True
+
+    def _rebuild(self, capacity: Optional[int] = None):
+        bloom = BloomFilter(max(capacity or self.capacity, len(self._revoked)), self.error_rate)
+        for jti in self._revoked:
+            bloom.add(jti)
+        self._bloom = bloom
+
+    async def revoke(self, jti: str, expires_at: float) -> bool:
+        """
+        Reject `jti` from now until `expires_at` (a Unix timestamp). Returns
+        False if it was already revoked, so single-use tokens can check and
+        revoke in one step. With Redis the check is a SET NX on the jti, which
+        holds across workers even before the next sync.
+        """
+        if expires_at <= time.time():
+            return False
+        revoked = self._add(jti, expires_at)
+        if self._redis is not None:
+            try:
+                claimed = await self._redis.set(f"{self._redis_key}:{jti}", 1, nx=True, exat=math.ceil(expires_at))
+                revoked = revoked and bool(claimed)
+                await self._redis.zadd(self._redis_key, {jti: expires_at})
+            except Exception as e:
+                logger.error(f"Failed to publish revocation of {jti}: {str(e)}")
+        return revoked
+
+    def invalidate_users(self, user_ids: Iterable[int]):
+        """
+        Record that these users changed. Safe to call from ORM event hooks: the
+        change is published to Redis on the next sync, not awaited here.
+        """
+        now = time.time()
+        with self._lock:
+            for user_id in user_ids:
+                self._invalidated_users[user_id] = now
+                if self._redis_url:
+                    self._unpublished_users[user_id] = now
+
+    def invalidated_at(self, user_id: int) -> float:
+        """When `user_id` last changed, as far as this worker knows; 0 if not recently."""
+        return self._invalidated_users.get(user_id, 0.0)
+
+    def _prune_users(self, now: float):
+        cutoff = now - self.user_retention
+        self._invalidated_users = {
+            user_id: changed_at for user_id, changed_at in self._invalidated_users.items() if changed_at > cutoff
+        }
+
+    def prune(self):
+        """Evict revocations whose tokens have expired anyway."""
+        now = time.time()
+        with self._lock:
+            expired = [jti for jti, expires_at in self._revoked.items() if expires_at <= now]
+            for jti in expired:
+                del self._revoked[jti]
+            if expired:
+                self._rebuild()
+            self._prune_users(now)
+
+    async def _sync_users(self, now: float):
+        with self._lock:
+            pending, self._unpublished_users = self._unpublished_users, {}
+        try:
+            if pending:
+                await self._redis.zadd(self._users_key, {str(user_id): ts for user_id, ts in pending.items()})
+        except Exception:
+            with self._lock:
+                # Retry on the next sync, unless the user changed again meanwhile
+                self._unpublished_users = {**pending, **self._unpublished_users}
+            raise
+        cutoff = now - self.user_retention
+        await self._redis.zremrangebyscore(self._users_key, "-inf", cutoff)
+        entries = await self._redis.zrangebyscore(self._users_key, cutoff, "+inf", withscores=True)
+        with self._lock:
+            for user_id, changed_at in entries:
+                user_id = int(user_id.decode() if isinstance(user_id, bytes) else user_id)
+                self._invalidated_users[user_id] = max(float(changed_at), self._invalidated_users.get(user_id, 0.0))
+            self._prune_users(now)
+
+    async def sync(self):
+        """Replace local state with the unexpired revocations held in Redis."""
+        now = time.time()
+        await self._redis.zremrangebyscore(self._redis_key, "-inf", now)
+        entries = await self._redis.zrangebyscore(self._redis_key, now, "+inf", withscores=True)
+        revoked = {
+            (jti.decode() if isinstance(jti, bytes) else jti): float(expires_at)
+            for jti, expires_at in entries
+        }
+        with self._lock:
+            # Keep local revocations whose publish to Redis failed
+            revoked.update({jti: exp for jti, exp in self._revoked.items() if exp > now})
+            self._revoked = revoked
+            self._rebuild()
+        await self._sync_users(now)
+
+    async def _run(self):
+        while True:
+            try:
+                if self._redis is not None:
+                    await self.sync()
+                else:
+                    self.prune()
+            except Exception as e:
+                logger.error(f"Token revocation sync failed: {str(e)}")
+            await asyncio.sleep(self.sync_interval)
+
+    def start(self):
+        if self._redis_url and self._redis is None:
+            # Imported lazily so deployments without Redis never need the client
+            from redis import asyncio as aioredis
+            self._redis = aioredis.Redis.from_url(self._redis_url)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._redis is not None:
+            await self._redis.close()
+            self._redis = None
+
+revocation_store = RevocationStore(
+    capacity=settings.AUTH_REVOCATION_BLOOM_CAPACITY,
+    error_rate=settings.AUTH_REVOCATION_BLOOM_ERROR_RATE,
+    redis_url=settings.REDIS_URL,
+    namespace=f"{settings.CACHE_NAMESPACE}:revoked-tokens",
+    sync_interval=settings.AUTH_REVOCATION_SYNC_SECONDS,
+    user_retention=settings.AUTH_TOKEN_CACHE_TTL_SECONDS
+)
@@ -0,0 +1,76 @@
+#routing.py
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from urllib.parse import unquote
+
+@dataclass(frozen=True)
+class RouteMatch:
+    service_name: str
+    service_url: str
+    forward_path: str
+
+class _RouteNode:
+    __slots__ = ("children", "service_name")
+
+    def __init__(self):
+        self.children: Dict[str, "_RouteNode"] = {}
+        self.service_name: Optional[str] = None
+
+class RouteTable:
+    """
+    Segment trie over the gateway route prefixes.
+
+    Prefixes may span several segments (e.g. 'api/v1'); resolution walks the
+    request path once and returns the longest matching prefix, so lookup cost
+    is proportional to the number of path segments, not the number of routes.
+    Segment matching is case-insensitive.
+    """
+
+    def __init__(self, services: Dict[str, str]):
+        self._root = _RouteNode()
+        self._services: Dict[str, str] = {}
+        for prefix, service_url in services.items():
+            if service_url:
+                self.add(prefix, service_url)
+
+    @property
+    def services(self) -> List[str]:
+        return list(self._services)
+
+    def add(self, prefix: str, service_url: str):
+        """Register a service under a (possibly multi-segment) prefix."""
+        node = self._root
+        for segment in self._split(prefix):
+            node = node.children.setdefault(segment.lower(), _RouteNode())
+        node.service_name = prefix
+        self._services[prefix] = service_url.rstrip('/')
+
+    def resolve(self, path: str) -> Optional[RouteMatch]:
+        """Resolve a request path to its service and the path to forward upstream."""
+        segments = self._split(self.decode(path))
+        node = self._root
+        match_name, match_depth = None, 0
+        for depth, segment in enumerate(segments, start=1):
+            node = node.children.get(segment.lower())
+            if node is None:
+                break
+            if node.service_name is not None:
+                match_name, match_depth = node.service_name, depth
+
+        if match_name is None:
+            return None
+
+        return RouteMatch(
+            service_name=match_name,
+            service_url=self._services[match_name],
+            forward_path='/' + '/'.join(segments[match_depth:])
+        )
+
+    @staticmethod
+    def decode(path: str) -> str:
+        """Undo URL encoding, including double-encoded slashes."""
+        return unquote(path).replace('%2F', '/')
+
+    @staticmethod
+    def _split(path: str) -> List[str]:
+        return path.lstrip('/').split('/')
@@ -0,0 +1,195 @@
+#shared_cache.py
+import json
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import date, datetime, time as dt_time
+from decimal import Decimal
+from typing import Any, Optional, Tuple
+from uuid import UUID
+
+from app.utils.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Part of every Redis key; bump it whenever the value encoding changes so
+# entries written in an older format are never decoded
+KEY_FORMAT_VERSION = "v3"
+
+# Marks a JSON object standing in for a value JSON has no type for
+_TYPE_KEY = "__cache_type__"
+
+def _to_json(value: Any) -> Any:
+    """Plain-JSON form of `value`, tagging types decode_value has to restore."""
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    if isinstance(value, dict):
+        if _TYPE_KEY not in value and all(isinstance(key, str) for key in value):
+            return {key: _to_json(item) for key, item in value.items()}
+        # Date, int or tuple keys (e.g. grouped aggregates) would not survive as strings
+        return {_TYPE_KEY: "dict", "items": [[_to_json(key), _to_json(item)] for key, item in value.items()]}
+    if isinstance(value, (list, tuple)):
+        return [_to_json(item) for item in value]
+    if isinstance(value, (set, frozenset)):
+        return {_TYPE_KEY: "set", "items": [_to_json(item) for item in value]}
+    # datetime before date: it is a subclass
+    for kind, cls in (("datetime", datetime), ("date", date), ("time", dt_time)):
+        if isinstance(value, cls):
+            return {_TYPE_KEY: kind, "value": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {_TYPE_KEY: "decimal", "value": str(value)}
+    if isinstance(value, UUID):
+        return {_TYPE_KEY: "uuid", "value": str(value)}
+    if hasattr(value, "item"):
+        # numpy/pandas scalars
+        return _to_json(value.item())
+    raise TypeError(f"{type(value).__name__} is not cacheable")
+
+def _hashable(value: Any) -> Any:
+    return tuple(_hashable(item) for item in value) if isinstance(value, list) else value
+
+_DECODERS = {
+    "dict": lambda obj: {_hashable(key): item for key, item in obj["items"]},
+    "set": lambda obj: {_hashable(item) for item in obj["items"]},
+    "datetime": lambda obj: datetime.fromisoformat(obj["value"]),
+    "date": lambda obj: date.fromisoformat(obj["value"]),
+    "time": lambda obj: dt_time.fromisoformat(obj["value"]),
+    "decimal": lambda obj: Decimal(obj["value"]),
+    "uuid": lambda obj: UUID(obj["value"]),
+}
+
+def _from_json_object(obj: dict) -> Any:
+    kind = obj.get(_TYPE_KEY)
+    return _DECODERS[kind](obj) if kind in _DECODERS else obj
+
+def encode_value(value: Any) -> bytes:
+    """
+    Serialize a cached value as JSON. Never pickle: anyone able to write to a
+    shared backend could otherwise run code in every worker that reads it.
+    Dates, times, Decimals, UUIDs, sets and non-string dict keys are tagged
+    and restored by decode_value; tuples come back as lists (or, as dict keys
+    and set items, as tuples). Raises TypeError for anything else.
+    """
+    return json.dumps(_to_json(value), separators=(",", ":")).encode()
+
+def decode_value(raw: bytes) -> Any:
+    return json.loads(raw, object_hook=_from_json_object)
+
+class CacheBackend(ABC):
+    """Async byte-value cache shared by the services in one deployment."""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None):
+        pass
+
+    @abstractmethod
+    async def delete(self, key: str):
+        pass
+
+    async def get_value(self, key: str) -> Any:
+        """Decoded value stored with set_value, or None on a miss."""
+        raw = await self.get(key)
+        return None if raw is None else decode_value(raw)
+
+    async def set_value(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        """Store `value` with encode_value; a value that cannot be encoded is logged and not cached."""
+        try:
+            raw = encode_value(value)
+        except (TypeError, ValueError, RecursionError) as e:
+            logger.warning(f"Not caching {key}: {str(e)}")
+            return False
+        await self.set(key, raw, ttl=ttl)
+        return True
+
+class InMemoryCacheBackend(CacheBackend):
+    """
+    Per-process LRU cache with per-key expiry. When `max_bytes` is set, the
+    least recently used entries are evicted to keep the stored values within
+    that budget.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[Optional[float], bytes]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    async def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None):
+        if self.max_bytes is not None and len(value) > self.max_bytes:
+            return
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (expires_at, value)
+            self._size += len(value)
+            while self.max_bytes is not None and self._size > self.max_bytes:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+
+    async def delete(self, key: str):
+        with self._lock:
+            self._remove(key)
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= len(entry[1])
+
+class RedisCacheBackend(CacheBackend):
+    """Cache shared by every worker and container through Redis."""
+
+    def __init__(self, url: str, namespace: str):
+        # Imported lazily so deployments without Redis never need the client
+        from redis import asyncio as aioredis
+        self._redis = aioredis.Redis.from_url(url)
+        self._namespace = namespace
+
+    def _key(self, key: str) -> str:
+        return f"{self._namespace}:{KEY_FORMAT_VERSION}:{key}"
+
+    async def get(self, key: str) -> Optional[bytes]:
+        try:
+            return await self._redis.get(self._key(key))
+        except Exception as e:
+            logger.error(f"Redis get failed for {key}: {str(e)}")
+            return None
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None):
+        try:
+            await self._redis.set(self._key(key), value, px=int(ttl * 1000) if ttl else None)
+        except Exception as e:
+            logger.error(f"Redis set failed for {key}: {str(e)}")
+
+    async def delete(self, key: str):
+        try:
+            await self._redis.delete(self._key(key))
+        except Exception as e:
+            logger.error(f"Redis delete failed for {key}: {str(e)}")
+
+def create_cache_backend(namespace: str, max_bytes: Optional[int] = None) -> CacheBackend:
+    """Redis when REDIS_URL is configured, otherwise an in-process cache."""
+    if settings.REDIS_URL:
+        return RedisCacheBackend(settings.REDIS_URL, namespace=f"{settings.CACHE_NAMESPACE}:{namespace}")
+    return InMemoryCacheBackend(max_bytes=max_bytes)
@@ -0,0 +1,42 @@
+#single_flight.py
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+class SingleFlight:
+    """
+    Deduplicates concurrent calls with the same key: the first caller starts
+    the work, later callers with the same key await that result instead of
+    starting their own. The work runs in its own task, so a caller that
+    disconnects does not cancel it for the others.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Task] = {}
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Return (result, shared); `shared` is True when another caller ran `fn`."""
+        task = self._calls.get(key)
+        if task is not None:
+            return await asyncio.shield(task), True
+
+        task = asyncio.ensure_future(fn())
+        self._calls[key] = task
+        task.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(task), False
+
+    def _forget(self, key: str, task: asyncio.Task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Every waiter may have gone away; retrieve the outcome so it is not
+        # reported as an unhandled task exception
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug(f"Coalesced call {key} failed: {task.exception()!r}")
+
+request_coalescer = SingleFlight()
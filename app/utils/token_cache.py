@@ -0,0 +1,141 @@
+#token_cache.py
+import hashlib
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from cachetools import TLRUCache
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.models.models import User, Organization
+from app.utils.config import settings
+from app.utils.revocation import revocation_store
+
+logger = logging.getLogger(__name__)
+
+@dataclass(frozen=True)
+class CachedPrincipal:
+    user_id: int
+    org_id: Optional[int]
+    expires_at: float
+    jti: Optional[str]
+    user_state: Dict[str, Any]
+    organizations: List[Dict[str, Any]]
+    cached_at: float
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU of principals whose bearer token has already been verified.
+
+    Entries are keyed by a SHA-256 of the token, never the token itself, and
+    expire at the token's exp claim or after AUTH_TOKEN_CACHE_TTL_SECONDS,
+    whichever comes first. Each hit hands out a fresh detached User rebuilt
+    from the cached column values, so requests never share ORM instances.
+
+    Changes to a user evict its entries here at once and, through the
+    revocation store, in other workers within AUTH_REVOCATION_SYNC_SECONDS
+    (with REDIS_URL). Writes that bypass the ORM events must call
+    invalidate_users themselves, or are only seen after the TTL.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, enabled: bool = True):
+        self.enabled = enabled
+        self.ttl = ttl
+        self._cache = TLRUCache(maxsize=maxsize, ttu=self._time_to_use, timer=time.time)
+        self._lock = threading.Lock()
+
+    def _time_to_use(self, key, value: CachedPrincipal, now: float) -> float:
+        return min(value.expires_at, now + self.ttl)
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """Return a current_user dict for a previously verified token, if cached."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._cache.get(self._key(token))
+        if entry is None:
+            return None
+        if revocation_store.is_revoked(entry.jti) or revocation_store.invalidated_at(entry.user_id) >= entry.cached_at:
+            with self._lock:
+                self._cache.pop(self._key(token), None)
+            return None
+        return {"user": self._rebuild(entry), "current_org_id": entry.org_id}
+
+    def put(self, token: str, user: User, org_id: Optional[int], exp: Optional[float], jti: Optional[str] = None):
+        """Cache a verified principal until the token expires or is revoked."""
+        if not self.enabled or exp is None:
+            return
+        entry = CachedPrincipal(
+            user_id=user.id,
+            org_id=org_id,
+            expires_at=float(exp),
+            jti=jti,
+            user_state=self._snapshot(user),
+            organizations=[self._snapshot(org) for org in user.organizations],
+            cached_at=time.time()
+        )
+        with self._lock:
+            self._cache[self._key(token)] = entry
+
+    def invalidate_user(self, user_id: int):
+        """Drop every cached token belonging to a user."""
+        self.invalidate_users([user_id])
+
+    def invalidate_users(self, user_ids):
+        """Drop every cached token belonging to any of the users, here and in the other workers."""
+        user_ids = set(user_ids)
+        revocation_store.invalidate_users(user_ids)
+        with self._lock:
+            stale_keys = [key for key, entry in self._cache.items() if entry.user_id in user_ids]
+            for key in stale_keys:
+                self._cache.pop(key, None)
+        if stale_keys:
+            logger.info(f"Invalidated {len(stale_keys)} cached token(s) for {len(user_ids)} user(s)")
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    @staticmethod
+    def _snapshot(instance) -> Dict[str, Any]:
+        return {attr.key: getattr(instance, attr.key) for attr in inspect(type(instance)).column_attrs}
+
+    @staticmethod
+    def _rebuild(entry: CachedPrincipal) -> User:
+        organizations = []
+        for org_state in entry.organizations:
+            org = Organization(**org_state)
+            make_transient_to_detached(org)
+            organizations.append(org)
+
+        user = User(**entry.user_state)
+        make_transient_to_detached(user)
+        set_committed_value(user, "organizations", organizations)
+        return user
+
+token_cache = VerifiedTokenCache(
+    maxsize=settings.AUTH_TOKEN_CACHE_MAXSIZE,
+    ttl=settings.AUTH_TOKEN_CACHE_TTL_SECONDS,
+    enabled=settings.AUTH_TOKEN_CACHE_ENABLED
+)
+
+# Invalidation hooks: any flushed change to a user row (role, data_access,
+# is_active, ...) or to its organization memberships evicts that user's tokens.
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_changed_user(mapper, connection, target):
+    token_cache.invalidate_user(target.id)
+
+@event.listens_for(User.organizations, "append")
+@event.listens_for(User.organizations, "remove")
+def _invalidate_membership_change(target, value, initiator):
+    if target.id is not None:
+        token_cache.invalidate_user(target.id)
@@ -0,0 +1,62 @@
+#gunicorn.conf.py
+# Gunicorn settings for running the gateway with several uvicorn workers.
+#
+#   gunicorn -c deployment/gunicorn.conf.py app.main:app
+import math
+import os
+import shutil
+
+def _cpu_limit() -> int:
+    """CPUs available to this container: cgroup quota first, then affinity."""
+    try:
+        # cgroup v2
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            return max(1, math.ceil(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+    try:
+        # cgroup v1
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:
+            quota = int(f.read())
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+            period = int(f.read())
+        if quota > 0:
+            return max(1, math.ceil(quota / period))
+    except (OSError, ValueError):
+        pass
+    return len(os.sched_getaffinity(0))
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+worker_class = "uvicorn.workers.UvicornWorker"
+workers = int(os.environ.get("WEB_CONCURRENCY") or _cpu_limit())
+# Workers check this to warn about per-process state such as token revocations
+os.environ["WEB_CONCURRENCY"] = str(workers)
+
+# Every worker builds its own HTTP clients, DB pools and hashing pool on
+# startup; preloading would share them across fork
+preload_app = False
+
+# Leave room for the gateway's own drain (GATEWAY_DRAIN_TIMEOUT_SECONDS)
+# before gunicorn kills a worker that is still shutting down
+graceful_timeout = float(os.environ.get("GATEWAY_DRAIN_TIMEOUT_SECONDS", "25")) + 5
+timeout = 120
+keepalive = 5
+
+accesslog = "-"
+errorlog = "-"
+
+# Prometheus metrics are aggregated across workers through this directory
+# (see app.utils.metrics.render_metrics)
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/prometheus-multiproc")
+
+def on_starting(server):
+    # Stale files from a previous run would be reported as live workers
+    metrics_dir = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir, exist_ok=True)
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,31 @@
+-- Composite indexes for the gateway's hot queries.
+--
+-- CREATE INDEX CONCURRENTLY cannot run inside a transaction block, so apply
+-- this file without wrapping it in one:
+--
+--   psql "$DATABASE_URL" -f deployment/migrations/001_auth_hot_query_indexes.sql
+--
+-- The login / get_current_user lookup (email = $1 OR username = $1) is served
+-- by a BitmapOr over the existing unique indexes ix_users_email and
+-- ix_users_username and needs nothing new.
+--
+-- Verify the resulting plans with:
+--
+--   python -m app.utils.query_plans --database-url "$DATABASE_URL" --no-seed
+
+-- Chat history: WHERE user_id = $1 AND session_id = $2 ORDER BY timestamp, id
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_interaction_history_user_session_timestamp
+    ON interaction_history (user_id, session_id, timestamp, id);
+
+-- Liked posts: WHERE user_id = $1 ORDER BY liked_at DESC, id DESC; article_id
+-- is included so the join to articles needs no heap visit on liked_posts
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_liked_posts_user_liked_at
+    ON liked_posts (user_id, liked_at, id) INCLUDE (article_id);
+
+-- Organization feeds and the liked-posts organization filter
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_articles_organization_id
+    ON articles (organization_id);
+
+ANALYZE interaction_history;
+ANALYZE liked_posts;
+ANALYZE articles;
@@ -0,0 +1,20 @@
+-- Store chat documents uncompressed out of line.
+--
+-- The document download endpoint streams original_document in 1 MB slices,
+-- one substr() per slice. On a compressed TOAST value every slice decompresses
+-- the whole document, so a download reads O(size^2) bytes; with EXTERNAL
+-- storage substr() fetches only the TOAST chunks it needs. Uploaded PDFs and
+-- spreadsheets barely compress anyway.
+--
+--   psql "$DATABASE_URL" -f deployment/migrations/002_interaction_document_storage.sql
+--
+-- SET STORAGE only affects values written afterwards and takes a brief
+-- ACCESS EXCLUSIVE lock, but does not rewrite the table.
+ALTER TABLE interaction_history ALTER COLUMN original_document SET STORAGE EXTERNAL;
+
+-- Optionally move existing documents to the new storage. This rewrites every
+-- row that has a document; run it off-peak, in batches on large tables:
+--
+--   UPDATE interaction_history
+--      SET original_document = original_document || ''::bytea
+--    WHERE original_document IS NOT NULL;
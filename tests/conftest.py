@@ -0,0 +1,21 @@
+import os
+
+# app.utils.config reads these at import time; the units under test need none of them
+REQUIRED_SETTINGS = {
+    "DB_PASSWORD": "test",
+    "DB_NAME": "test",
+    "DB_HOST": "localhost",
+    "DB_PORT": "5432",
+    "SECRET_KEY": "test",
+    "OPENAI_API_KEY": "test",
+    "SERVICE_KEY_SALT": "test",
+    "NARRATIVE_SERVICE_URL": "http://narrative",
+    "CHATBOT_SERVICE_URL": "http://chatbot",
+    "METRIC_DISCOVERY_SERVICE_URL": "http://metric-discovery",
+    "METRICS_SERVICE_URL": "http://metrics",
+    "ORGANIZATIONS_SERVICE_URL": "http://organizations",
+    "DATA_SOURCE_SERVICE_URL": "http://data-source",
+}
+
+for name, value in REQUIRED_SETTINGS.items():
+    os.environ.setdefault(name, value)
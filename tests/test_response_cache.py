@@ -0,0 +1,58 @@
+import asyncio
+from types import SimpleNamespace
+
+from fastapi import Request, Response
+
+from app.utils.response_cache import ResponseCache
+from app.utils.shared_cache import InMemoryCacheBackend
+
+def make_request(path="/narrative/feed"):
+    return Request({"type": "http", "method": "GET", "path": path, "query_string": b"", "headers": []})
+
+def make_principal(user_id):
+    user = SimpleNamespace(id=user_id, role="member", data_access="all")
+    return {"user": user, "current_org_id": 1}
+
+def make_cache():
+    return ResponseCache(
+        InMemoryCacheBackend(),
+        services=["narrative"],
+        default_ttl=30.0,
+        stale_seconds=0.0,
+        max_entry_bytes=1024
+    )
+
+def store_and_lookup(cache_control):
+    cache = make_cache()
+    alice, bob = make_principal(1), make_principal(2)
+    headers = {"cache-control": cache_control} if cache_control else {}
+
+    async def run():
+        response = Response(content=b'{"owner": 1}', headers=headers)
+        await cache.store(make_request(), "narrative", "feed", alice, response)
+        return (
+            await cache.lookup(make_request(), "narrative", "feed", alice),
+            await cache.lookup(make_request(), "narrative", "feed", bob)
+        )
+
+    return asyncio.run(run())
+
+def test_response_without_cache_control_is_not_shared_between_users():
+    own, other = store_and_lookup(None)
+    assert own is not None and own.body == b'{"owner": 1}'
+    assert other is None
+
+def test_max_age_alone_is_not_shared_between_users():
+    own, other = store_and_lookup("max-age=60")
+    assert own is not None
+    assert other is None
+
+def test_private_response_is_not_shared_between_users():
+    own, other = store_and_lookup("private, max-age=60")
+    assert own is not None
+    assert other is None
+
+def test_public_response_is_shared_within_the_context():
+    own, other = store_and_lookup("public, max-age=60")
+    assert own is not None
+    assert other is not None and other.body == own.body
@@ -0,0 +1,54 @@
+import asyncio
+import time
+
+from app.utils.revocation import RevocationStore
+
+class FakeRedis:
+    """The sorted-set and SET NX subset of redis.asyncio the store uses."""
+
+    def __init__(self):
+        self.values = {}
+        self.sorted_sets = {}
+
+    async def set(self, key, value, nx=False, exat=None):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+    async def zadd(self, key, mapping):
+        self.sorted_sets.setdefault(key, {}).update(mapping)
+
+    async def zremrangebyscore(self, key, low, high):
+        members = self.sorted_sets.get(key, {})
+        for member in [m for m, score in members.items() if float(low) <= score <= float(high)]:
+            del members[member]
+
+    async def zrangebyscore(self, key, low, high, withscores=False):
+        members = self.sorted_sets.get(key, {})
+        return [(m, score) for m, score in members.items() if float(low) <= score <= float(high)]
+
+def make_workers(redis):
+    workers = [RevocationStore(100, 0.01, redis_url="redis://test") for _ in range(2)]
+    for worker in workers:
+        worker._redis = redis
+    return workers
+
+def test_refresh_token_can_only_be_revoked_once_across_workers():
+    first, second = make_workers(FakeRedis())
+
+    async def run():
+        expires_at = time.time() + 60
+        return await first.revoke("jti", expires_at), await second.revoke("jti", expires_at)
+
+    assert asyncio.run(run()) == (True, False)
+
+def test_user_invalidation_reaches_other_workers_on_sync():
+    first, second = make_workers(FakeRedis())
+    before = time.time()
+    first.invalidate_users([7])
+    assert second.invalidated_at(7) == 0.0
+
+    asyncio.run(first.sync())
+    asyncio.run(second.sync())
+    assert second.invalidated_at(7) >= before
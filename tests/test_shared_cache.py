@@ -0,0 +1,41 @@
+import asyncio
+from datetime import date, datetime, time
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from app.utils.shared_cache import InMemoryCacheBackend, decode_value, encode_value
+
+def test_round_trip_restores_types():
+    value = {
+        "total": Decimal("10.25"),
+        "as_of": datetime(2024, 1, 2, 3, 4, 5),
+        "opens": time(9, 30),
+        "id": uuid4(),
+        "tags": {"a", "b"},
+        "by_day": {date(2024, 1, 1): 3, date(2024, 1, 2): 4},
+        "by_bucket": {1: "one", (2, "x"): "pair"},
+        "rows": [{"n": 1}, (2, 3)],
+    }
+    decoded = decode_value(encode_value(value))
+    assert decoded == {**value, "rows": [{"n": 1}, [2, 3]]}
+    assert isinstance(decoded["total"], Decimal)
+    assert isinstance(next(iter(decoded["by_day"])), date)
+
+def test_string_keys_that_look_like_tags_round_trip():
+    value = {"__cache_type__": "date", "value": "2024-01-01"}
+    assert decode_value(encode_value(value)) == value
+
+def test_unencodable_value_raises_type_error():
+    with pytest.raises(TypeError):
+        encode_value({"handle": object()})
+
+def test_set_value_skips_unencodable_values():
+    cache = InMemoryCacheBackend()
+
+    async def run():
+        stored = await cache.set_value("key", {"handle": object()})
+        return stored, await cache.get_value("key")
+
+    assert asyncio.run(run()) == (False, None)